@@ -58,6 +58,9 @@ def downgrade_camerainfo_to_rosbag1(src: Path, dst: Path) -> None:
     )
     CameraInfo = typestore.sensor_msgs__msg__CameraInfo  # type: ignore[attr-defined]
 
+    # Generate updated message definition and md5sum for CameraInfo once.
+    camerainfo_msgdef = gendefhash('sensor_msgs/msg/CameraInfo', {}, typestore)
+
     with AnyReader([src]) as reader, Writer(dst) as writer:
         conn_map = {}
 
@@ -66,7 +69,7 @@ def downgrade_camerainfo_to_rosbag1(src: Path, dst: Path) -> None:
 
             # Use updated message definition and md5sum for CameraInfo.
             if conn.msgtype == 'sensor_msgs/msg/CameraInfo':
-                msgdef, md5sum = gendefhash(conn.msgtype, {}, typestore)
+                msgdef, md5sum = camerainfo_msgdef
             else:
                 msgdef, md5sum = conn.msgdef, conn.digest
 
@@ -4,7 +4,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from contextlib import closing
+from functools import lru_cache
+from queue import Queue
+from threading import Event, Thread
+from typing import TYPE_CHECKING, cast
 
 from rosbags.interfaces import Connection, ConnectionExtRosbag1, ConnectionExtRosbag2
 from rosbags.rosbag1 import Reader as Reader1
@@ -21,7 +25,9 @@ from rosbags.typesys.msg import generate_msgdef
 
 if TYPE_CHECKING:
     from pathlib import Path
-    from typing import Optional, Sequence
+    from typing import Callable, Generator, Iterable, Optional, Sequence, TypeVar, Union
+
+    T = TypeVar('T')
 
 LATCH = """
 - history: 3
@@ -42,10 +48,90 @@ LATCH = """
 """.strip()
 
 
+PREFETCH_SIZE = 256
+CACHE_SIZE = 4096
+CACHE_MAX_MSGSIZE = 4096
+
+
 class ConverterError(Exception):
     """Converter Error."""
 
 
+def prefetch(iterable: Iterable[T], maxsize: int = PREFETCH_SIZE) -> Generator[T, None, None]:
+    """Iterate over iterable in a background thread.
+
+    Items are passed through a bounded queue, which allows reading and
+    decompressing the source bag to overlap with conversion and writing.
+    Exceptions raised by the iterable are reraised in the consuming thread.
+
+    Args:
+        iterable: Iterable to consume in background.
+        maxsize: Maximum number of items buffered ahead of the consumer.
+
+    Yields:
+        Items of iterable.
+
+    """
+    done = object()
+    queue: Queue[Union[T, object]] = Queue(maxsize)
+    stop = Event()
+    errors: list[BaseException] = []
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                queue.put(item)
+                if stop.is_set():
+                    break
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(err)
+        finally:
+            queue.put(done)
+
+    thread = Thread(target=produce, daemon=True)
+    thread.start()
+    finished = False
+    try:
+        while (item := queue.get()) is not done:
+            yield cast('T', item)
+        finished = True
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+        while not finished:
+            finished = queue.get() is done
+        thread.join()
+
+
+def cached(
+    func: Callable[[bytes, str], memoryview],
+    maxsize: int = CACHE_SIZE,
+) -> Callable[[bytes, str], memoryview]:
+    """Wrap message conversion function with a cache.
+
+    Bags often contain long runs of identical small messages, e.g. on
+    latched or static topics. Repeated payloads are looked up by content
+    and converted only once. Large messages bypass the cache.
+
+    Args:
+        func: Conversion function taking rawdata and message type name.
+        maxsize: Maximum number of cached conversions.
+
+    Returns:
+        Caching conversion function.
+
+    """
+    cache = lru_cache(maxsize)(func)
+
+    def convert_cached(data: bytes, typename: str) -> memoryview:
+        if len(data) <= CACHE_MAX_MSGSIZE:
+            return cache(data, typename)
+        return func(data, typename)
+
+    return convert_cached
+
+
 def upgrade_connection(rconn: Connection) -> Connection:
     """Convert rosbag1 connection to rosbag2 connection.
 
@@ -118,37 +204,44 @@ def convert_1to2(
 
     """
     with Reader1(src) as reader, Writer2(dst) as writer:
-        connmap: dict[int, Connection] = {}
+        exclude = frozenset(exclude_topics)
+        include = frozenset(include_topics)
         connections = [
             x for x in reader.connections
-            if x.topic not in exclude_topics and (not include_topics or x.topic in include_topics)
+            if x.topic not in exclude and (not include or x.topic in include)
         ]
         if not connections:
             raise ConverterError('No connections left for conversion.')
+        # Connection ids are small integers, a list is faster to index than a dict.
+        # Every slot of a selected connection is filled before messages are read.
+        connmap: list[Connection] = [None] * (  # type: ignore[list-item]
+            max(x.id for x in connections) + 1
+        )
+        existing: dict[tuple[str, str, ConnectionExtRosbag2], Connection] = {}
+        registered: set[tuple[str, str]] = set()
         for rconn in connections:
             candidate = upgrade_connection(rconn)
             assert isinstance(candidate.ext, ConnectionExtRosbag2)
-            for conn in writer.connections:
-                assert isinstance(conn.ext, ConnectionExtRosbag2)
-                if (
-                    conn.topic == candidate.topic and conn.msgtype == candidate.msgtype and
-                    conn.ext == candidate.ext
-                ):
-                    break
-            else:
-                typs = get_types_from_msg(rconn.msgdef, rconn.msgtype)
-                register_types(typs)
+            key = (candidate.topic, candidate.msgtype, candidate.ext)
+            if (conn := existing.get(key)) is None:
+                if (rconn.msgtype, rconn.msgdef) not in registered:
+                    typs = get_types_from_msg(rconn.msgdef, rconn.msgtype)
+                    register_types(typs)
+                    registered.add((rconn.msgtype, rconn.msgdef))
                 conn = writer.add_connection(
                     candidate.topic,
                     candidate.msgtype,
                     serialization_format=candidate.ext.serialization_format,
                     offered_qos_profiles=candidate.ext.offered_qos_profiles,
                 )
+                existing[key] = conn
             connmap[rconn.id] = conn
 
-        for rconn, timestamp, data in reader.messages(connections=connections):
-            data = ros1_to_cdr(data, rconn.msgtype)
-            writer.write(connmap[rconn.id], timestamp, data)
+        convert_msg = cached(ros1_to_cdr)
+        with closing(prefetch(reader.messages(connections=connections))) as messages:
+            for rconn, timestamp, data in messages:
+                data = convert_msg(data, rconn.msgtype)
+                writer.write(connmap[rconn.id], timestamp, data)
 
 
 def convert_2to1(
@@ -170,24 +263,25 @@ def convert_2to1(
 
     """
     with Reader2(src) as reader, Writer1(dst) as writer:
-        connmap: dict[int, Connection] = {}
+        exclude = frozenset(exclude_topics)
+        include = frozenset(include_topics)
         connections = [
             x for x in reader.connections
-            if x.topic not in exclude_topics and (not include_topics or x.topic in include_topics)
+            if x.topic not in exclude and (not include or x.topic in include)
         ]
         if not connections:
             raise ConverterError('No connections left for conversion.')
+        # Connection ids are small integers, a list is faster to index than a dict.
+        # Every slot of a selected connection is filled before messages are read.
+        connmap: list[Connection] = [None] * (  # type: ignore[list-item]
+            max(x.id for x in connections) + 1
+        )
+        existing: dict[tuple[str, str, Optional[int]], Connection] = {}
         for rconn in connections:
             candidate = downgrade_connection(rconn)
             assert isinstance(candidate.ext, ConnectionExtRosbag1)
-            for conn in writer.connections:
-                assert isinstance(conn.ext, ConnectionExtRosbag1)
-                if (
-                    conn.topic == candidate.topic and conn.digest == candidate.digest and
-                    conn.ext.latching == candidate.ext.latching
-                ):
-                    break
-            else:
+            key = (candidate.topic, candidate.digest, candidate.ext.latching)
+            if (conn := existing.get(key)) is None:
                 conn = writer.add_connection(
                     candidate.topic,
                     candidate.msgtype,
@@ -196,10 +290,14 @@ def convert_2to1(
                     candidate.ext.callerid,
                     candidate.ext.latching,
                 )
+                existing[key] = conn
             connmap[rconn.id] = conn
 
+        # Rosbag2 storage plugins may hold thread bound handles, e.g. sqlite3
+        # connections, messages are therefore read in the calling thread.
+        convert_msg = cached(cdr_to_ros1)
         for rconn, timestamp, data in reader.messages(connections=connections):
-            data = cdr_to_ros1(data, rconn.msgtype)
+            data = convert_msg(data, rconn.msgtype)
             writer.write(connmap[rconn.id], timestamp, data)
 
 
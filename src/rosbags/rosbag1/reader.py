@@ -11,7 +11,7 @@ import struct
 from bz2 import decompress as bz2_decompress
 from collections import defaultdict
 from enum import Enum, IntEnum
-from functools import reduce
+from functools import cached_property, reduce
 from io import BytesIO
 from itertools import groupby
 from pathlib import Path
@@ -425,6 +425,7 @@ class Reader:
                     *x[6:],
                 ) for x in self.connections
             ]
+            self.__dict__.pop('topics', None)
         except ReaderError:
             self.close()
             raise
@@ -456,7 +457,7 @@ class Reader:
         """Total message count."""
         return reduce(lambda x, y: x + y, (x.msgcount for x in self.topics.values()), 0)
 
-    @property
+    @cached_property
     def topics(self) -> dict[str, TopicInfo]:
         """Topic information."""
         topics = {}
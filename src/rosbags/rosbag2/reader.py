@@ -4,6 +4,9 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING, Protocol
@@ -12,6 +15,14 @@ import zstandard
 from ruamel.yaml import YAML
 from ruamel.yaml.error import YAMLError
 
+try:
+    from yaml import CSafeLoader
+    from yaml import YAMLError as LibyamlError
+    from yaml import load as libyaml_load
+except ImportError:  # pragma: no cover
+    CSafeLoader = None
+    LibyamlError = YAMLError
+
 from rosbags.interfaces import Connection, ConnectionExtRosbag2, TopicInfo
 
 from .errors import ReaderError
@@ -20,10 +31,60 @@ from .storage_sqlite3 import ReaderSqlite3
 
 if TYPE_CHECKING:
     from types import TracebackType
-    from typing import Generator, Iterable, Literal, Optional, Type, Union
+    from typing import Any, Generator, Iterable, Literal, Optional, Type, Union
 
     from .metadata import FileInformation, Metadata
 
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def load_yaml(data: bytes) -> Any:  # noqa: ANN401
+    """Load YAML document.
+
+    The libyaml based loader of PyYAML is used if available, it is
+    significantly faster than the pure Python ruamel.yaml loader. The
+    document is passed as bytes, decoding is left to the YAML reader.
+
+    PyYAML implements YAML 1.1, which resolves plain scalars like yes, off,
+    or 1:30 to booleans and integers, where YAML 1.2 keeps them as strings.
+    Of the rosbag2 metadata only the free-form custom_data values are
+    affected, documents with non-string values there are loaded with
+    ruamel.yaml.
+
+    Args:
+        data: Encoded YAML document.
+
+    Returns:
+        Loaded document.
+
+    """
+    if CSafeLoader:  # pragma: no branch
+        dct = libyaml_load(data, Loader=CSafeLoader)
+        try:
+            values = (dct['rosbag2_bagfile_information'].get('custom_data') or {}).values()
+        except (AttributeError, KeyError, TypeError):
+            return dct
+        if all(isinstance(x, str) for x in values):
+            return dct
+    return YAML(typ='safe').load(data)
+
+
+def decompress_file(src: Path, dst: Path) -> Path:
+    """Decompress zstd compressed file.
+
+    Args:
+        src: Compressed source file.
+        dst: Decompressed destination file.
+
+    Returns:
+        Destination path.
+
+    """
+    decomp = zstandard.ZstdDecompressor(max_window_size=2**31)
+    with src.open('rb') as infile, dst.open('wb') as outfile:
+        decomp.copy_stream(infile, outfile, read_size=COPY_CHUNK_SIZE, write_size=COPY_CHUNK_SIZE)
+    return dst
+
 
 class StorageProtocol(Protocol):
     """Storage Protocol."""
@@ -94,11 +155,10 @@ class Reader:
         yamlpath = path / 'metadata.yaml'
         self.path = path
         try:
-            yaml = YAML(typ='safe')
-            dct = yaml.load(yamlpath.read_text())
+            dct = load_yaml(yamlpath.read_bytes())
         except OSError as err:
             raise ReaderError(f'Could not read metadata at {yamlpath}: {err}.') from None
-        except YAMLError as exc:
+        except (YAMLError, LibyamlError) as exc:
             raise ReaderError(f'Could not load YAML from {yamlpath}: {exc}') from None
 
         try:
@@ -110,31 +170,29 @@ class Reader:
                     f'Storage plugin {storageid!r} not supported; please report issue.',
                 )
 
+            with os.scandir(path) as entries:
+                present = {x.name for x in entries}
             self.paths = [path / Path(x).name for x in self.metadata['relative_file_paths']]
-            if missing := [x for x in self.paths if not x.exists()]:
+            if missing := [x for x in self.paths if x.name not in present]:
                 raise ReaderError(f'Some database files are missing: {[str(x) for x in missing]!r}')
 
-            self.connections = [
-                Connection(
-                    id=idx + 1,
-                    topic=x['topic_metadata']['name'],
-                    msgtype=x['topic_metadata']['type'],
-                    msgdef='',
-                    digest=x['topic_metadata'].get('type_description_hash', ''),
-                    msgcount=x['message_count'],
-                    ext=ConnectionExtRosbag2(
-                        serialization_format=x['topic_metadata']['serialization_format'],
-                        offered_qos_profiles=x['topic_metadata'].get('offered_qos_profiles', ''),
+            self.connections = []
+            for idx, topic in enumerate(self.metadata['topics_with_message_count'], start=1):
+                meta = topic['topic_metadata']
+                if (fmt := meta['serialization_format']) != 'cdr':
+                    raise ReaderError(f'Serialization format {fmt!r} is not supported.')
+                self.connections.append(
+                    Connection(
+                        idx,
+                        meta['name'],
+                        meta['type'],
+                        '',
+                        meta.get('type_description_hash', ''),
+                        topic['message_count'],
+                        ConnectionExtRosbag2(fmt, meta.get('offered_qos_profiles', '')),
+                        self,
                     ),
-                    owner=self,
-                ) for idx, x in enumerate(self.metadata['topics_with_message_count'])
-            ]
-            noncdr = {
-                fmt for x in self.connections if isinstance(x.ext, ConnectionExtRosbag2)
-                if (fmt := x.ext.serialization_format) != 'cdr'
-            }
-            if noncdr:
-                raise ReaderError(f'Serialization format {noncdr!r} is not supported.')
+                )
 
             if self.compression_mode and (cfmt := self.compression_format) != 'zstd':
                 raise ReaderError(f'Compression format {cfmt!r} is not supported.')
@@ -180,7 +238,7 @@ class Reader:
         mode = self.metadata.get('compression_mode', '').lower()
         return mode if mode != 'none' else None
 
-    @property
+    @cached_property
     def topics(self) -> dict[str, TopicInfo]:
         """Topic information."""
         return {x.topic: TopicInfo(x.msgtype, x.msgdef, x.msgcount, [x]) for x in self.connections}
@@ -192,16 +250,14 @@ class Reader:
 
     def open(self) -> None:
         """Open rosbag2."""
-        storage_paths = []
         if self.compression_mode == 'file':
             self.tmpdir = TemporaryDirectory()  # pylint: disable=consider-using-with
             tmpdir = self.tmpdir.name
-            decomp = zstandard.ZstdDecompressor()
-            for path in self.paths:
-                storage_file = Path(tmpdir, path.stem)
-                with path.open('rb') as infile, storage_file.open('wb') as outfile:
-                    decomp.copy_stream(infile, outfile)
-                storage_paths.append(storage_file)
+            workers = max(1, min(len(self.paths), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                storage_paths = list(
+                    pool.map(lambda x: decompress_file(x, Path(tmpdir, x.stem)), self.paths),
+                )
         else:
             storage_paths = self.paths[:]
 
@@ -210,19 +266,13 @@ class Reader:
             self.connections,
         )
         self.storage.open()
-        definitions = self.storage.get_definitions()
-        for idx, conn in enumerate(self.connections):
-            if desc := definitions.get(conn.msgtype):
-                self.connections[idx] = Connection(
-                    id=conn.id,
-                    topic=conn.topic,
-                    msgtype=conn.msgtype,
-                    msgdef=desc[1],
-                    digest=desc[0],
-                    msgcount=conn.msgcount,
-                    ext=conn.ext,
-                    owner=conn.owner,
-                )
+        if definitions := self.storage.get_definitions():
+            # The storage plugin shares the connection list, update it in place.
+            self.connections[:] = [
+                x._replace(msgdef=desc[1], digest=desc[0])
+                if (desc := definitions.get(x.msgtype)) else x for x in self.connections
+            ]
+            self.__dict__.pop('topics', None)
 
     def close(self) -> None:
         """Close rosbag2."""
@@ -247,8 +297,8 @@ class Reader:
             start: Yield only messages at or after this timestamp (ns).
             stop: Yield only messages before this timestamp (ns).
 
-        Yields:
-            tuples of connection, timestamp (ns), and rawdata.
+        Returns:
+            Generator yielding tuples of connection, timestamp (ns), and rawdata.
 
         Raises:
             ReaderError: If reader was not opened.
@@ -257,12 +307,14 @@ class Reader:
         if not self.storage:
             raise ReaderError('Rosbag is not open.')
 
+        messages = self.storage.messages(connections, start, stop)
         if self.compression_mode == 'message':
+            # Messages are decompressed one by one on purpose, batching with
+            # multi_decompress_to_buffer is slower as segments need to be
+            # copied out. The decompressor is per call as it is not threadsafe.
             decomp = zstandard.ZstdDecompressor().decompress
-            for connection, timestamp, data in self.storage.messages(connections, start, stop):
-                yield connection, timestamp, decomp(data)
-        else:
-            yield from self.storage.messages(connections, start, stop)
+            return ((conn, timestamp, decomp(data)) for conn, timestamp, data in messages)
+        return messages
 
     def __enter__(self) -> Reader:
         """Open rosbag2 when entering contextmanager."""
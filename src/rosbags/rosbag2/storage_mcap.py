@@ -5,8 +5,12 @@
 from __future__ import annotations
 
 import heapq
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from io import BytesIO
-from struct import iter_unpack, unpack_from
+from struct import Struct
+from threading import local
 from typing import TYPE_CHECKING, NamedTuple
 
 import zstandard
@@ -15,11 +19,23 @@ from lz4.frame import decompress as lz4_decompress
 from .errors import ReaderError
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from pathlib import Path
-    from typing import BinaryIO, Callable, Generator, Iterable, Optional
+    from typing import (
+        BinaryIO,
+        Callable,
+        Generator,
+        Iterable,
+        Iterator,
+        Optional,
+        Sequence,
+        Tuple,
+    )
 
     from rosbags.interfaces import Connection
 
+    Msg = Tuple[int, int, Connection, bytes]
+
 
 class Schema(NamedTuple):
     """Schema."""
@@ -80,78 +96,225 @@ class Statistics(NamedTuple):
     channel_message_counts: bytes
 
 
-class Msg(NamedTuple):
-    """Message wrapper."""
-
-    timestamp: int
-    offset: int
-    connection: Optional[Connection]
-    data: Optional[bytes]
+unpack_uint16 = Struct('<H').unpack_from
+unpack_uint32 = Struct('<I').unpack_from
+unpack_uint64 = Struct('<Q').unpack_from
+unpack_channel_header = Struct('<HH').unpack_from
+unpack_message_header = Struct('<HIQQ').unpack_from
+unpack_message_record = Struct('<QHIQQ').unpack_from
+unpack_chunk_header = Struct('<QQQI').unpack_from
+unpack_chunk_index = Struct('<QQQQ').unpack_from
+unpack_chunk_sizes = Struct('<QQ').unpack_from
+unpack_statistics = Struct('<QHIIIIQQ').unpack_from
+unpack_message_index_header = Struct('<QH').unpack_from
+iter_unpack_offsets = Struct('<HQ').iter_unpack
+iter_unpack_index = Struct('<QQ').iter_unpack
 
 
 def read_sized(bio: BinaryIO) -> bytes:
     """Read one record."""
-    return bio.read(unpack_from('<Q', bio.read(8))[0])
+    return bio.read(unpack_uint64(bio.read(8))[0])
 
 
 def skip_sized(bio: BinaryIO) -> None:
     """Read one record."""
-    bio.seek(unpack_from('<Q', bio.read(8))[0], 1)
+    bio.seek(unpack_uint64(bio.read(8))[0], 1)
 
 
-def read_bytes(bio: BinaryIO) -> bytes:
+def read_string(bio: BinaryIO) -> str:
     """Read string."""
-    return bio.read(unpack_from('<I', bio.read(4))[0])
+    return bio.read(unpack_uint32(bio.read(4))[0]).decode()
 
 
-def read_string(bio: BinaryIO) -> str:
-    """Read string."""
-    return bio.read(unpack_from('<I', bio.read(4))[0]).decode()
+def unpack_bytes(data: bytes, pos: int) -> tuple[bytes, int]:
+    """Unpack bytes at position, return bytes and position after."""
+    end = pos + 4 + unpack_uint32(data, pos)[0]
+    return data[pos + 4:end], end
+
+
+def unpack_string(data: bytes, pos: int) -> tuple[str, int]:
+    """Unpack string at position, return string and position after."""
+    end = pos + 4 + unpack_uint32(data, pos)[0]
+    return data[pos + 4:end].decode(), end
+
+
+def unpack_schema(data: bytes, pos: int) -> Schema:
+    """Unpack schema record body at position."""
+    key, = unpack_uint16(data, pos)
+    name, pos = unpack_string(data, pos + 2)
+    encoding, pos = unpack_string(data, pos)
+    return Schema(key, name, encoding, unpack_string(data, pos)[0])
+
+
+def unpack_channel(data: bytes, pos: int, schemas: dict[int, Schema]) -> Channel:
+    """Unpack channel record body at position."""
+    key, schema_id = unpack_channel_header(data, pos)
+    topic, pos = unpack_string(data, pos + 4)
+    message_encoding, pos = unpack_string(data, pos)
+    return Channel(
+        key,
+        schemas[schema_id].name,
+        topic,
+        message_encoding,
+        unpack_bytes(data, pos)[0],
+    )
+
+
+ZSTD_LOCAL = local()
+
+PREFETCH_CHUNKS = 8
+PREFETCH_BYTES = 64 << 20
+
+POOL: list[ThreadPoolExecutor] = []
+
+
+def get_pool() -> ThreadPoolExecutor:
+    """Get decompression pool shared by all MCAP readers."""
+    if not POOL:
+        POOL.append(ThreadPoolExecutor(min(os.cpu_count() or 1, PREFETCH_CHUNKS)))
+    return POOL[0]
+
+
+def zstd_decompress(data: bytes, size: int) -> bytes:
+    """Decompress zstd data with decompressor of current thread."""
+    decompressor: zstandard.ZstdDecompressor
+    try:
+        decompressor = ZSTD_LOCAL.decompressor
+    except AttributeError:
+        decompressor = ZSTD_LOCAL.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(data, max_output_size=size)
 
 
 DECOMPRESSORS: dict[str, Callable[[bytes, int], bytes]] = {
     '': lambda x, _: x,
     'lz4': lambda x, _: lz4_decompress(x),  # type: ignore
-    'zstd': zstandard.ZstdDecompressor().decompress,
+    'zstd': zstd_decompress,
 }
 
 
-def msgsrc(
+def chunk_has_channels(bio: BinaryIO, skip: int, channel_map: dict[int, Connection]) -> bool:
+    """Check if message indexes following chunk reference any mapped channel.
+
+    The message index records directly follow the chunk record, they are
+    checked without decompressing the chunk. Chunks without message
+    indexes are assumed to contain all channels. The file position is
+    restored.
+
+    """
+    pos = bio.tell()
+    bio.seek(skip, 1)
+    channel_ids = set()
+    while bio.read(1) == b'\x07':
+        size, channel_id = unpack_message_index_header(bio.read(10))
+        channel_ids.add(channel_id)
+        bio.seek(size - 2, 1)
+    bio.seek(pos)
+    return not channel_ids or not channel_map.keys().isdisjoint(channel_ids)
+
+
+def read_message_index(
     chunk: ChunkInfo,
     channel_map: dict[int, Connection],
     start: int,
     stop: int,
     bio: BinaryIO,
-) -> Generator[Msg, None, None]:
-    """Yield messages from chunk in time order."""
-    yield Msg(chunk.message_start_time, 0, None, None)
+) -> list[tuple[int, int, int]]:
+    """Read message index entries of selected channels in time order."""
+    base = chunk.chunk_start_offset + chunk.chunk_length
+    bio.seek(base)
+    data = bio.read(chunk.message_index_length)
+    view = memoryview(data)
+
+    entries = []
+    for channel_id, offset in chunk.message_index_offsets.items():
+        if channel_id not in channel_map:
+            continue
+        pos = offset - base + 11
+        size, = unpack_uint32(data, pos)
+        entries += [
+            (log_time, msgoffset, channel_id)
+            for log_time, msgoffset in iter_unpack_index(view[pos + 4:pos + 4 + size])
+            if start <= log_time < stop
+        ]
+    entries.sort()
+    return entries
+
+
+def load_chunk(
+    chunk: ChunkInfo,
+    channel_map: dict[int, Connection],
+    start: int,
+    stop: int,
+    bio: BinaryIO,
+    pool: Executor,
+) -> tuple[list[tuple[int, int, int]], Optional[Future[bytes]]]:
+    """Read selected index entries of chunk and submit its decompression."""
+    if not (entries := read_message_index(chunk, channel_map, start, stop, bio)):
+        return entries, None
 
     bio.seek(chunk.chunk_start_offset + 9 + 40 + len(chunk.compression))
     compressed_data = bio.read(chunk.compressed_size)
-    subio = BytesIO(DECOMPRESSORS[chunk.compression](compressed_data, chunk.uncompressed_size))
-
-    messages = []
-    while (offset := subio.tell()) < chunk.uncompressed_size:
-        op_ = ord(subio.read(1))
-        if op_ == 0x05:
-            recio = BytesIO(read_sized(subio))
-            channel_id, _, log_time, _ = unpack_from(
-                '<HIQQ',
-                recio.read(22),
-            )
-            if start <= log_time < stop and channel_id in channel_map:
-                messages.append(
-                    Msg(
-                        log_time,
-                        chunk.chunk_start_offset + offset,
-                        channel_map[channel_id],
-                        recio.read(),
-                    ),
-                )
-        else:
-            skip_sized(subio)
+    if not chunk.compression:
+        future: Future[bytes] = Future()
+        future.set_result(compressed_data)
+        return entries, future
+    return entries, pool.submit(
+        DECOMPRESSORS[chunk.compression],
+        compressed_data,
+        chunk.uncompressed_size,
+    )
+
+
+def msgsrc(
+    chunk: ChunkInfo,
+    channel_map: dict[int, Connection],
+    fetch: Callable[[], tuple[list[tuple[int, int, int]], Optional[Future[bytes]]]],
+) -> Generator[Msg, None, None]:
+    """Yield messages from chunk in time order."""
+    entries, future = fetch()
+    data = future.result() if future else b''
+    view = memoryview(data)
+
+    for log_time, offset, channel_id in entries:
+        size, = unpack_uint64(data, offset + 1)
+        yield (
+            log_time,
+            chunk.chunk_start_offset + offset,
+            channel_map[channel_id],
+            bytes(view[offset + 31:offset + 9 + size]),
+        )
+
+
+def merge_msgsrcs(
+    chunks: Sequence[ChunkInfo],
+    msgsrcs: Sequence[Iterator[Msg]],
+) -> Generator[Msg, None, None]:
+    """Merge message sources of chunks sorted by start time.
+
+    Unlike heapq.merge, sources are started only once their chunk start
+    time is reached, so chunks are read lazily in time order.
+
+    """
+    heap: list[tuple[Msg, Iterator[Msg]]] = []
+    pending = 0
+    while True:
+        while pending < len(msgsrcs) and (
+            not heap or chunks[pending].message_start_time <= heap[0][0][0]
+        ):
+            src = msgsrcs[pending]
+            pending += 1
+            if msg := next(src, None):
+                heapq.heappush(heap, (msg, src))
+
+        if not heap:
+            return
 
-    yield from sorted(messages, key=lambda x: x.timestamp)
+        msg, src = heap[0]
+        yield msg
+        if nxt := next(src, None):
+            heapq.heapreplace(heap, (nxt, src))
+        else:
+            heapq.heappop(heap)
 
 
 class MCAPFile:
@@ -188,8 +351,7 @@ class MCAPFile:
         if op_ != 0x01:
             raise ReaderError('Unexpected record.')
 
-        recio = BytesIO(read_sized(self.bio))
-        profile = read_string(recio)
+        profile, _ = unpack_string(read_sized(self.bio), 0)
         if profile != 'ros2':
             raise ReaderError('Profile is not ros2.')
         self.data_start = self.bio.tell()
@@ -204,7 +366,7 @@ class MCAPFile:
         assert len(data) == 37
         assert data[0:9] == b'\x02\x14\x00\x00\x00\x00\x00\x00\x00', data[0:9]
 
-        summary_start, = unpack_from('<Q', data, 9)
+        summary_start, = unpack_uint64(data, 9)
         if summary_start:
             self.data_end = summary_start
             self.read_index()
@@ -221,45 +383,39 @@ class MCAPFile:
         chunks = self.chunks
 
         bio.seek(self.data_end)
+        data = bio.read()
+        view = memoryview(data)
+
+        end = 0
         while True:
-            op_ = ord(bio.read(1))
+            op_ = data[end]
+            pos = end + 9
+            end = pos + unpack_uint64(data, end + 1)[0]
 
             if op_ in (0x02, 0x0e):
                 break
 
             if op_ == 0x03:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schemas[key] = Schema(
-                    key,
-                    read_string(bio),
-                    read_string(bio),
-                    read_string(bio),
-                )
+                schema = unpack_schema(data, pos)
+                schemas[schema.id] = schema
 
             elif op_ == 0x04:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schema_name = schemas[unpack_from('<H', bio.read(2))[0]].name
-                channels[key] = Channel(
-                    key,
-                    schema_name,
-                    read_string(bio),
-                    read_string(bio),
-                    read_bytes(bio),
-                )
+                channel = unpack_channel(data, pos, schemas)
+                channels[channel.id] = channel
 
             elif op_ == 0x08:
-                bio.seek(8, 1)
+                index = unpack_chunk_index(data, pos)
+                size, = unpack_uint32(data, pos + 32)
+                pos += 36 + size
+                message_index_offsets = dict(iter_unpack_offsets(view[pos - size:pos]))
+                message_index_length, = unpack_uint64(data, pos)
+                compression, pos = unpack_string(data, pos + 8)
                 chunk = ChunkInfo(  # type: ignore
-                    *unpack_from('<QQQQ', bio.read(32), 0),
-                    {
-                        x[0]: x[1] for x in
-                        iter_unpack('<HQ', bio.read(unpack_from('<I', bio.read(4))[0]))
-                    },
-                    *unpack_from('<Q', bio.read(8), 0),
-                    read_string(bio),
-                    *unpack_from('<QQ', bio.read(16), 0),
+                    *index,
+                    message_index_offsets,
+                    message_index_length,
+                    compression,
+                    *unpack_chunk_sizes(data, pos),
                     {},
                 )
                 offset_channel = sorted((v, k) for k, v in chunk.message_index_offsets.items())
@@ -276,26 +432,12 @@ class MCAPFile:
                 )
                 chunks.append(chunk)
 
-            elif op_ == 0x0a:
-                skip_sized(bio)
-
             elif op_ == 0x0b:
-                bio.seek(8, 1)
                 self.statistics = Statistics(
-                    *unpack_from(
-                        '<QHIIIIQQ',
-                        bio.read(42),
-                        0,
-                    ),
-                    read_bytes(bio),  # type: ignore
+                    *unpack_statistics(data, pos),
+                    unpack_bytes(data, pos + 42)[0],  # type: ignore
                 )
 
-            elif op_ == 0x0d:
-                skip_sized(bio)
-
-            else:
-                skip_sized(bio)
-
     def close(self) -> None:
         """Close MCAP."""
         assert self.bio
@@ -316,30 +458,16 @@ class MCAPFile:
             op_ = ord(bio.read(1))
 
             if op_ == 0x03:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schemas[key] = Schema(
-                    key,
-                    read_string(bio),
-                    read_string(bio),
-                    read_string(bio),
-                )
+                schema = unpack_schema(read_sized(bio), 0)
+                schemas[schema.id] = schema
             elif op_ == 0x04:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schema_name = schemas[unpack_from('<H', bio.read(2))[0]].name
-                channels[key] = Channel(
-                    key,
-                    schema_name,
-                    read_string(bio),
-                    read_string(bio),
-                    read_bytes(bio),
-                )
+                channel = unpack_channel(read_sized(bio), 0, schemas)
+                channels[channel.id] = channel
             elif op_ == 0x06:
                 bio.seek(8, 1)
-                _, _, uncompressed_size, _ = unpack_from('<QQQI', bio.read(28))
+                _, _, uncompressed_size, _ = unpack_chunk_header(bio.read(28))
                 compression = read_string(bio)
-                compressed_size, = unpack_from('<Q', bio.read(8))
+                compressed_size, = unpack_uint64(bio.read(8))
                 bio = BytesIO(
                     DECOMPRESSORS[compression](bio.read(compressed_size), uncompressed_size),
                 )
@@ -357,6 +485,17 @@ class MCAPFile:
             self.meta_scan()
         return {schema.name: (schema.encoding[4:], schema.data) for schema in self.schemas.values()}
 
+    def get_channel_map(self, connections: Iterable[Connection]) -> dict[int, Connection]:
+        """Map channel ids to connections with same topic and message type."""
+        channel_ids: dict[tuple[str, str], int] = {}
+        for channel in self.channels.values():
+            channel_ids.setdefault((channel.schema, channel.topic), channel.id)
+        return {
+            cid: conn
+            for conn in connections
+            if (cid := channel_ids.get((conn.msgtype, conn.topic))) is not None
+        }
+
     def messages_scan(
         self,
         connections: Iterable[Connection],
@@ -370,25 +509,17 @@ class MCAPFile:
         bio_size = self.data_end
         bio.seek(self.data_start)
 
-        schemas = self.schemas.copy()
-        channels = self.channels.copy()
-
-        if channels:
+        if self.channels:
             read_meta = False
-            channel_map = {
-                cid: conn for conn in connections if (
-                    cid := next(
-                        (
-                            cid for cid, x in self.channels.items()
-                            if x.schema == conn.msgtype and x.topic == conn.topic
-                        ),
-                        None,
-                    )
-                )
-            }
+            channel_map = self.get_channel_map(connections)
         else:
             read_meta = True
+            schemas = self.schemas.copy()
+            channels: dict[int, Channel] = {}
             channel_map = {}
+            connection_keys: dict[tuple[str, str], Connection] = {}
+            for connection in connections:
+                connection_keys.setdefault((connection.topic, connection.msgtype), connection)
 
         if start is None:
             start = 0
@@ -399,45 +530,28 @@ class MCAPFile:
             op_ = ord(bio.read(1))
 
             if op_ == 0x03 and read_meta:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schemas[key] = Schema(
-                    key,
-                    read_string(bio),
-                    read_string(bio),
-                    read_string(bio),
-                )
+                schema = unpack_schema(read_sized(bio), 0)
+                schemas[schema.id] = schema
             elif op_ == 0x04 and read_meta:
-                bio.seek(8, 1)
-                key, = unpack_from('<H', bio.read(2))
-                schema_name = schemas[unpack_from('<H', bio.read(2))[0]].name
-                channels[key] = Channel(
-                    key,
-                    schema_name,
-                    read_string(bio),
-                    read_string(bio),
-                    read_bytes(bio),
-                )
-                conn = next(
-                    (
-                        x for x in connections
-                        if x.topic == channels[key].topic and x.msgtype == schema_name
-                    ),
-                    None,
-                )
-                if conn:
-                    channel_map[key] = conn
+                channel = unpack_channel(read_sized(bio), 0, schemas)
+                channels[channel.id] = channel
+                if conn := connection_keys.get((channel.topic, channel.schema)):
+                    channel_map[channel.id] = conn
             elif op_ == 0x05:
-                size, channel_id, _, timestamp, _ = unpack_from('<QHIQQ', bio.read(30))
-                data = bio.read(size - 22)
+                size, channel_id, _, timestamp, _ = unpack_message_record(bio.read(30))
                 if start <= timestamp < stop and channel_id in channel_map:
-                    yield channel_map[channel_id], timestamp, data
+                    yield channel_map[channel_id], timestamp, bio.read(size - 22)
+                else:
+                    bio.seek(size - 22, 1)
             elif op_ == 0x06:
-                size, = unpack_from('<Q', bio.read(8))
-                start_time, end_time, uncompressed_size, _ = unpack_from('<QQQI', bio.read(28))
-                if read_meta or (start < end_time and start_time < stop):
+                size, = unpack_uint64(bio.read(8))
+                start_time, end_time, uncompressed_size, _ = unpack_chunk_header(bio.read(28))
+                if read_meta or (
+                    start < end_time and start_time < stop and
+                    chunk_has_channels(bio, size - 28, channel_map)
+                ):
                     compression = read_string(bio)
-                    compressed_size, = unpack_from('<Q', bio.read(8))
+                    compressed_size, = unpack_uint64(bio.read(8))
                     bio = BytesIO(
                         DECOMPRESSORS[compression](bio.read(compressed_size), uncompressed_size),
                     )
@@ -474,38 +588,55 @@ class MCAPFile:
             yield from self.messages_scan(connections, start, stop)
             return
 
-        channel_map = {
-            cid: conn for conn in connections if (
-                cid := next(
-                    (
-                        cid for cid, x in self.channels.items()
-                        if x.schema == conn.msgtype and x.topic == conn.topic
-                    ),
-                    None,
+        channel_map = self.get_channel_map(connections)
+
+        chunks = sorted(
+            (
+                x for x in self.chunks
+                if x.message_start_time != 0 and (start is None or start < x.message_end_time) and
+                (stop is None or x.message_start_time < stop) and
+                (any(x.channel_count.get(cid, 0) for cid in channel_map))
+            ),
+            key=lambda x: x.message_start_time,
+        )
+
+        pool = get_pool()
+        loaded: dict[int, tuple[list[tuple[int, int, int]], Optional[Future[bytes]]]] = {}
+        submitted = 0
+
+        def fetch(idx: int) -> tuple[list[tuple[int, int, int]], Optional[Future[bytes]]]:
+            # Chunks are first read in start time order, keep a window of
+            # chunks ahead decompressing in the pool. The window is bounded
+            # in count and in uncompressed bytes.
+            nonlocal submitted
+            assert self.bio
+            while submitted < len(chunks) and (
+                submitted <= idx or submitted < idx + PREFETCH_CHUNKS and
+                sum(chunks[x].uncompressed_size for x in loaded) < PREFETCH_BYTES
+            ):
+                chunk = chunks[submitted]
+                loaded[submitted] = load_chunk(
+                    chunk,
+                    channel_map,
+                    start or chunk.message_start_time,
+                    stop or chunk.message_end_time + 1,
+                    self.bio,
+                    pool,
                 )
-            )
-        }
+                submitted += 1
+            return loaded.pop(idx)
 
-        chunks = [
-            msgsrc(
-                x,
-                channel_map,
-                start or x.message_start_time,
-                stop or x.message_end_time + 1,
-                self.bio,
-            )
-            for x in self.chunks
-            if x.message_start_time != 0 and (start is None or start < x.message_end_time) and
-            (stop is None or x.message_start_time < stop) and
-            (any(x.channel_count.get(cid, 0) for cid in channel_map))
-        ]
-
-        for timestamp, offset, connection, data in heapq.merge(*chunks):
-            if not offset:
-                continue
-            assert connection
-            assert data
-            yield connection, timestamp, data
+        msgsrcs = [msgsrc(x, channel_map, partial(fetch, idx)) for idx, x in enumerate(chunks)]
+        try:
+            for timestamp, _, connection, data in merge_msgsrcs(chunks, msgsrcs):
+                yield connection, timestamp, data
+        finally:
+            # Prefetched chunks of an abandoned generator must not keep
+            # the shared pool busy.
+            for _, future in loaded.values():
+                if future:
+                    future.cancel()
+            loaded.clear()
 
 
 class ReaderMcap:
@@ -7,8 +7,7 @@ from __future__ import annotations
 import sqlite3
 from typing import TYPE_CHECKING
 
-from rosbags.typesys.base import hash_rihs01
-from rosbags.typesys.msg import get_types_from_msg
+from rosbags.typesys.msg import get_rihs01
 
 from .errors import ReaderError
 
@@ -18,6 +17,9 @@ if TYPE_CHECKING:
 
     from rosbags.interfaces import Connection
 
+FETCH_SIZE = 1024
+MAX_ATTACHED = 10
+
 
 class ReaderSqlite3:
     """Sqlite3 storage reader."""
@@ -36,29 +38,48 @@ class ReaderSqlite3:
         """
         self.paths = paths
         self.dbconns: list[sqlite3.Connection] = []
+        self.dbnames: list[list[tuple[int, str]]] = []
+        self.topicnames: list[dict[int, str]] = []
         self.schema = 0
         self.msgtypes: list[dict[str, str]] = []
         self.connections = connections
 
     def open(self) -> None:
         """Open rosbag2."""
-        for path in self.paths:
-            conn = sqlite3.connect(f'file:{path}?immutable=1', uri=True)
-            conn.row_factory = lambda _, x: x
+        for idx, path in enumerate(self.paths):
+            uri = f'file:{path}?immutable=1'
+            if slot := idx % (MAX_ATTACHED + 1):
+                # Split files are attached to a shared connection, so sqlite
+                # merges them in time order within a single query.
+                name = f'db{slot}'
+                conn = self.dbconns[-1]
+                conn.execute(f'ATTACH DATABASE ? AS {name}', (uri,))
+            else:
+                name = 'main'
+                conn = sqlite3.connect(uri, uri=True)
+                self.dbconns.append(conn)
+                self.dbnames.append([])
+
             cur = conn.cursor()
             cur.execute(
-                'SELECT count(*) FROM sqlite_master '
+                f'SELECT count(*) FROM {name}.sqlite_master '
                 'WHERE type="table" AND name IN ("messages", "topics")',
             )
             if cur.fetchone()[0] != 2:
                 raise ReaderError(f'Cannot open database {path} or database missing tables.')
 
-            self.dbconns.append(conn)
+            self.dbnames[-1].append((idx, name))
+            self.topicnames.append(
+                {row[1]: row[0] for row in cur.execute(f'SELECT name,id FROM {name}.topics')},
+            )
 
         cur = self.dbconns[-1].cursor()
-        if cur.execute('PRAGMA table_info(schema)').fetchall():
-            schema, = cur.execute('SELECT schema_version FROM schema').fetchone()
-        elif any(x[1] == 'offered_qos_profiles' for x in cur.execute('PRAGMA table_info(topics)')):
+        if cur.execute(f'PRAGMA {name}.table_info(schema)').fetchall():
+            schema, = cur.execute(f'SELECT schema_version FROM {name}.schema').fetchone()
+        elif any(
+            x[1] == 'offered_qos_profiles'
+            for x in cur.execute(f'PRAGMA {name}.table_info(topics)')
+        ):
             schema = 2
         else:
             schema = 1
@@ -72,19 +93,14 @@ class ReaderSqlite3:
                     'digest': x[3],
                 } for x in cur.execute(
                     'SELECT topic_type, encoding, encoded_message_definition, type_description_hash'
-                    ' FROM message_definitions ORDER BY id',
+                    f' FROM {name}.message_definitions ORDER BY id',
                 )
             ]
             for typ in msgtypes:
                 assert typ['encoding'] == 'ros2msg'
-                types = get_types_from_msg(typ['msgdef'], typ['name'])
-
-                class Store:  # pylint: disable=too-few-public-methods
-                    FIELDDEFS = types
-
-                assert typ['digest'] == hash_rihs01(
+                assert typ['digest'] == get_rihs01(
                     typ['name'],
-                    Store,
+                    typ['msgdef'],
                 ), f'Failed to parse {typ["name"]}'
         else:
             msgtypes = []
@@ -98,6 +114,8 @@ class ReaderSqlite3:
         for dbconn in self.dbconns:
             dbconn.close()
         self.dbconns.clear()
+        self.dbnames.clear()
+        self.topicnames.clear()
 
     def get_definitions(self) -> dict[str, tuple[str, str]]:
         """Get message definitions."""
@@ -129,10 +147,7 @@ class ReaderSqlite3:
         if not self.dbconns:
             raise ReaderError('Rosbag has not been opened.')
 
-        query = [
-            'SELECT topics.id,messages.timestamp,messages.data',
-            'FROM messages JOIN topics ON messages.topic_id=topics.id',
-        ]
+        query = []
         args: list[Any] = []
         clause = 'WHERE'
 
@@ -152,19 +167,30 @@ class ReaderSqlite3:
             args.append(stop)
             clause = 'AND'
 
-        query.append('ORDER BY timestamp')
-        querystr = ' '.join(query)
+        filters = ' '.join(query)
 
-        for conn in self.dbconns:
-            cur = conn.cursor()
-            cur.execute('SELECT name,id FROM topics')
-            connmap: dict[int, Connection] = {
-                row[1]: next((x for x in self.connections if x.topic == row[0]),
-                             None)  # type: ignore
-                for row in cur
-            }
+        # Connections are resolved per call, as the reader updates them with
+        # message definitions after opening the storage.
+        topicmap: dict[str, Connection] = {}
+        for connection in self.connections:
+            topicmap.setdefault(connection.topic, connection)
+        connmaps: list[dict[int, Connection]] = [
+            {cid: topicmap.get(topic) for cid, topic in names.items()}  # type: ignore[misc]
+            for names in self.topicnames
+        ]
 
-            cur.execute(querystr, args)
+        for conn, names in zip(self.dbconns, self.dbnames):
+            querystr = ' UNION ALL '.join(
+                f'SELECT {idx},topics.id,messages.timestamp,messages.data'
+                f' FROM {name}.messages AS messages'
+                f' JOIN {name}.topics AS topics ON messages.topic_id=topics.id {filters}'
+                for idx, name in names
+            ) + ' ORDER BY timestamp'
+
+            cur = conn.cursor()
+            cur.arraysize = FETCH_SIZE
+            cur.execute(querystr, args * len(names))
 
-            for cid, timestamp, data in cur:
-                yield connmap[cid], timestamp, data
+            while rows := cur.fetchmany():
+                for idx, cid, timestamp, data in rows:
+                    yield connmaps[idx][cid], timestamp, data
@@ -5,23 +5,78 @@
 from __future__ import annotations
 
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum, auto
+from operator import itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import zstandard
 from ruamel.yaml import YAML
 
+try:
+    from yaml import CSafeDumper
+    from yaml import dump as libyaml_dump
+except ImportError:  # pragma: no cover
+    CSafeDumper = None
+
 from rosbags.interfaces import Connection, ConnectionExtRosbag2
-from rosbags.typesys.base import hash_rihs01
-from rosbags.typesys.msg import generate_msgdef, get_types_from_msg
+from rosbags.typesys.msg import generate_msgdef, get_rihs01
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from types import TracebackType
-    from typing import Literal, Optional, Type, Union
+    from typing import Any, Callable, Literal, Optional, TextIO, Type, Union
 
     from .metadata import Metadata
 
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def dump_yaml(data: Any, stream: TextIO) -> None:  # noqa: ANN401
+    """Dump YAML document.
+
+    The libyaml based dumper of PyYAML is used if available, it is
+    significantly faster than the pure Python ruamel.yaml dumper. Both
+    produce equivalent YAML documents, but the output is not byte
+    identical, e.g. long scalars are wrapped and escaped differently.
+
+    Args:
+        data: Document to dump.
+        stream: Output stream.
+
+    """
+    if CSafeDumper:
+        libyaml_dump(
+            data,
+            stream,
+            Dumper=CSafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
+    else:  # pragma: no cover
+        yaml = YAML(typ='safe')
+        yaml.default_flow_style = False
+        yaml.dump(data, stream)
+
+
+def compress_rows(
+    compressor: zstandard.ZstdCompressor,
+    rows: list[tuple[int, int, bytes]],
+) -> list[tuple[int, int, bytes]]:
+    """Compress data of message rows.
+
+    Args:
+        compressor: Zstandard compressor.
+        rows: Message rows.
+
+    Returns:
+        Message rows with compressed data.
+
+    """
+    compress = compressor.compress
+    return [(cid, timestamp, compress(data)) for cid, timestamp, data in rows]
+
 
 class WriterError(Exception):
     """Writer Error."""
@@ -66,10 +121,23 @@ class Writer:  # pylint: disable=too-many-instance-attributes
       timestamp INTEGER NOT NULL,
       data BLOB NOT NULL
     );
-    CREATE INDEX timestamp_idx ON messages (timestamp ASC);
     INSERT INTO schema(schema_version, ros_distro) VALUES (4, 'rosbags');
     """
 
+    # Created on close, maintaining it during bulk inserts is slower.
+    SQLITE_INDEX = 'CREATE INDEX timestamp_idx ON messages (timestamp ASC)'
+
+    SQLITE_INSERT_MSGDEF = (
+        'INSERT INTO message_definitions (topic_type, encoding, encoded_message_definition,'
+        ' type_description_hash) VALUES(?, ?, ?, ?)'
+    )
+    SQLITE_INSERT_TOPIC = 'INSERT INTO topics VALUES(?, ?, ?, ?, ?, ?)'
+    SQLITE_INSERT_MESSAGE = 'INSERT INTO messages (topic_id, timestamp, data) VALUES(?, ?, ?)'
+
+    INSERT_BATCH_SIZE = 1000
+    COMMIT_INTERVAL = 10
+    OPTIMIZE_MIN_MESSAGES = 10000
+
     class CompressionMode(IntEnum):
         """Compession modes."""
 
@@ -82,6 +150,28 @@ class Writer:  # pylint: disable=too-many-instance-attributes
 
         ZSTD = auto()
 
+    class StoragePreset(IntEnum):
+        """Storage presets."""
+
+        DEFAULT = auto()
+        WRITE_OPTIMIZED = auto()
+        RESILIENT = auto()
+
+    STORAGE_PRAGMAS = {
+        StoragePreset.DEFAULT: '',
+        StoragePreset.WRITE_OPTIMIZED: """
+        PRAGMA page_size=4096;
+        PRAGMA journal_mode=MEMORY;
+        PRAGMA synchronous=OFF;
+        PRAGMA cache_size=1000;
+        """,
+        StoragePreset.RESILIENT: """
+        PRAGMA page_size=4096;
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        """,
+    }
+
     def __init__(self, path: Union[Path, str]):
         """Initialize writer.
 
@@ -101,12 +191,22 @@ class Writer:  # pylint: disable=too-many-instance-attributes
         self.compression_mode = ''
         self.compression_format = ''
         self.compressor: Optional[zstandard.ZstdCompressor] = None
+        self.storage_preset = self.StoragePreset.DEFAULT
         self.connections: list[Connection] = []
-        self.counts: dict[int, int] = {}
+        self.connection_ids: set[int] = set()
+        self.connection_keys: dict[tuple[str, str, ConnectionExtRosbag2], Connection] = {}
+        # Indexed by connection id, which starts at 1.
+        self.counts: list[int] = [0]
+        self.msgbuf: list[tuple[int, int, bytes]] = []
+        self.flushes = 0
+        self.timespan: Optional[tuple[int, int]] = None
         self.conn: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
+        self.insert: Optional[Callable[[int, int, bytes], None]] = None
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.pending: Optional[Future[list[tuple[int, int, bytes]]]] = None
         self.custom_data: dict[str, str] = {}
-        self.added_types: list[str] = []
+        self.added_types: set[str] = set()
 
     def set_compression(self, mode: CompressionMode, fmt: CompressionFormat) -> None:
         """Enable compression on bag.
@@ -127,7 +227,32 @@ class Writer:  # pylint: disable=too-many-instance-attributes
             return
         self.compression_mode = mode.name.lower()
         self.compression_format = fmt.name.lower()
-        self.compressor = zstandard.ZstdCompressor()
+        if mode == self.CompressionMode.FILE:
+            self.compressor = zstandard.ZstdCompressor(threads=-1)
+        else:
+            self.compressor = zstandard.ZstdCompressor()
+
+    def set_storage_preset(self, preset: StoragePreset) -> None:
+        """Select SQLite storage preset.
+
+        The presets mirror the rosbag2 sqlite3 storage plugin. The default
+        preset keeps the SQLite defaults. The write optimized preset disables
+        journaling to disk and syncing, a crash while writing can corrupt the
+        bag. The resilient preset writes through a WAL journal and commits
+        every batch, the journal mode is reset when the bag is closed.
+
+        This function has to be called before opening.
+
+        Args:
+            preset: Storage preset to use.
+
+        Raises:
+            WriterError: Bag already open.
+
+        """
+        if self.conn:
+            raise WriterError(f'Cannot set storage preset, bag {self.path} already open.')
+        self.storage_preset = preset
 
     def set_custom_data(self, key: str, value: str) -> None:
         """Set key value pair in custom_data.
@@ -155,9 +280,16 @@ class Writer:  # pylint: disable=too-many-instance-attributes
         except FileExistsError:
             raise WriterError(f'{self.path} exists already, not overwriting.') from None
 
-        self.conn = sqlite3.connect(f'file:{self.dbpath}', uri=True)
+        # Transactions are managed explicitly, inserts are committed every
+        # COMMIT_INTERVAL batches and on close.
+        self.conn = sqlite3.connect(self.dbpath, isolation_level=None)
+        self.conn.executescript(self.STORAGE_PRAGMAS[self.storage_preset])
         self.conn.executescript(self.SQLITE_SCHEMA)
+        self.conn.execute('BEGIN')
         self.cursor = self.conn.cursor()
+        if self.compression_mode == 'message':
+            self.pool = ThreadPoolExecutor(max_workers=1)
+        self.insert = self.make_insert()
 
     def add_connection(
         self,
@@ -193,23 +325,21 @@ class Writer:  # pylint: disable=too-many-instance-attributes
 
         if msgdef is None or rihs01 is None:
             msgdef, _ = generate_msgdef(msgtype, ros_version=2)
-            types = get_types_from_msg(msgdef, msgtype)
-
-            class Store:  # pylint: disable=too-few-public-methods
-                FIELDDEFS = types
-
-            rihs01 = hash_rihs01(msgtype, Store)
+            rihs01 = get_rihs01(msgtype, msgdef)
         assert msgdef
         assert rihs01
 
         if msgtype not in self.added_types:
             self.cursor.execute(
-                'INSERT INTO message_definitions (topic_type, encoding, encoded_message_definition,'
-                ' type_description_hash) VALUES(?, ?, ?, ?)',
+                self.SQLITE_INSERT_MSGDEF,
                 (msgtype, 'ros2msg', msgdef, rihs01),
             )
-            self.added_types.append(msgtype)
+            self.added_types.add(msgtype)
 
+        ext = ConnectionExtRosbag2(
+            serialization_format=serialization_format,
+            offered_qos_profiles=offered_qos_profiles,
+        )
         connection = Connection(
             id=len(self.connections) + 1,
             topic=topic,
@@ -217,23 +347,19 @@ class Writer:  # pylint: disable=too-many-instance-attributes
             msgdef=msgdef,
             digest=rihs01,
             msgcount=0,
-            ext=ConnectionExtRosbag2(
-                serialization_format=serialization_format,
-                offered_qos_profiles=offered_qos_profiles,
-            ),
+            ext=ext,
             owner=self,
         )
-        for conn in self.connections:
-            if (
-                conn.topic == connection.topic and conn.msgtype == connection.msgtype and
-                conn.ext == connection.ext
-            ):
-                raise WriterError(f'Connection can only be added once: {connection!r}.')
+        key = (topic, msgtype, ext)
+        if key in self.connection_keys:
+            raise WriterError(f'Connection can only be added once: {connection!r}.')
 
         self.connections.append(connection)
-        self.counts[connection.id] = 0
+        self.connection_ids.add(connection.id)
+        self.connection_keys[key] = connection
+        self.counts.append(0)
         meta = (connection.id, topic, msgtype, serialization_format, offered_qos_profiles, '')
-        self.cursor.execute('INSERT INTO topics VALUES(?, ?, ?, ?, ?, ?)', meta)
+        self.cursor.execute(self.SQLITE_INSERT_TOPIC, meta)
         return connection
 
     def write(self, connection: Connection, timestamp: int, data: bytes) -> None:
@@ -248,20 +374,82 @@ class Writer:  # pylint: disable=too-many-instance-attributes
             WriterError: Bag not open or topic not registered.
 
         """
-        if not self.cursor:
+        insert = self.insert
+        if not insert:
             raise WriterError('Bag was not opened.')
-        if connection not in self.connections:
+        if connection.id not in self.connection_ids:
             raise WriterError(f'Tried to write to unknown connection {connection!r}.')
 
-        if self.compression_mode == 'message':
-            assert self.compressor
-            data = self.compressor.compress(data)
+        insert(connection.id, timestamp, data)
 
-        self.cursor.execute(
-            'INSERT INTO messages (topic_id, timestamp, data) VALUES(?, ?, ?)',
-            (connection.id, timestamp, data),
-        )
-        self.counts[connection.id] += 1
+    def make_insert(self) -> Callable[[int, int, bytes], None]:
+        """Create message insert function for current bag settings.
+
+        Returns:
+            Function buffering a single message.
+
+        """
+        msgbuf = self.msgbuf
+        append = msgbuf.append
+        counts = self.counts
+        flush = self.flush
+        batch_size = self.INSERT_BATCH_SIZE
+
+        def insert(cid: int, timestamp: int, data: bytes) -> None:
+            # Buffered data must not change if the caller reuses its buffer.
+            append((cid, timestamp, bytes(data)))
+            counts[cid] += 1
+            if len(msgbuf) >= batch_size:
+                flush()
+
+        return insert
+
+    def flush(self) -> None:
+        """Insert buffered messages into database.
+
+        In message compression mode the batch is handed to a background
+        thread, and the previously compressed batch is inserted instead.
+        The open transaction is committed every COMMIT_INTERVAL batches.
+
+        """
+        assert self.conn
+        assert self.cursor
+        msgbuf = self.msgbuf
+        if not msgbuf:
+            return
+
+        start = min(map(itemgetter(1), msgbuf))
+        end = max(map(itemgetter(1), msgbuf))
+        if self.timespan:
+            start = min(start, self.timespan[0])
+            end = max(end, self.timespan[1])
+        self.timespan = (start, end)
+
+        if self.pool:
+            assert self.compressor
+            self.drain()
+            # Rows hold snapshots of the message data, see make_insert, the
+            # compressor thread never reads buffers owned by the caller.
+            self.pending = self.pool.submit(compress_rows, self.compressor, msgbuf.copy())
+        else:
+            self.cursor.executemany(self.SQLITE_INSERT_MESSAGE, msgbuf)
+        msgbuf.clear()
+
+        self.flushes += 1
+        if self.storage_preset == self.StoragePreset.RESILIENT:
+            interval = 1
+        else:
+            interval = self.COMMIT_INTERVAL
+        if self.flushes % interval == 0:
+            self.conn.execute('COMMIT')
+            self.conn.execute('BEGIN')
+
+    def drain(self) -> None:
+        """Insert pending compressed batch into database."""
+        assert self.cursor
+        if self.pending:
+            self.cursor.executemany(self.SQLITE_INSERT_MESSAGE, self.pending.result())
+            self.pending = None
 
     def close(self) -> None:
         """Close rosbag2 after writing.
@@ -271,15 +459,27 @@ class Writer:  # pylint: disable=too-many-instance-attributes
         """
         assert self.cursor
         assert self.conn
+        self.flush()
+        self.drain()
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
         self.cursor.close()
         self.cursor = None
+        self.insert = None
 
-        duration, start, count = self.conn.execute(
-            'SELECT max(timestamp) - min(timestamp), min(timestamp), count(*) FROM messages',
-        ).fetchone()
+        count = sum(self.counts)
+        start, duration = 0, 0
+        if self.timespan:
+            start = self.timespan[0]
+            duration = self.timespan[1] - start
 
+        self.conn.execute(self.SQLITE_INDEX)
         self.conn.commit()
-        self.conn.execute('PRAGMA optimize')
+        if count >= self.OPTIMIZE_MIN_MESSAGES:
+            self.conn.execute('PRAGMA optimize')
+        if self.storage_preset == self.StoragePreset.RESILIENT:
+            self.conn.execute('PRAGMA journal_mode=DELETE')
         self.conn.close()
 
         if self.compression_mode == 'file':
@@ -287,7 +487,12 @@ class Writer:  # pylint: disable=too-many-instance-attributes
             src = self.dbpath
             self.dbpath = src.with_suffix(f'.db3.{self.compression_format}')
             with src.open('rb') as infile, self.dbpath.open('wb') as outfile:
-                self.compressor.copy_stream(infile, outfile)
+                self.compressor.copy_stream(
+                    infile,
+                    outfile,
+                    read_size=COPY_CHUNK_SIZE,
+                    write_size=COPY_CHUNK_SIZE,
+                )
             src.unlink()
 
         metadata: dict[str, Metadata] = {
@@ -333,9 +538,7 @@ class Writer:  # pylint: disable=too-many-instance-attributes
             },
         }
         with self.metapath.open('w') as metafile:
-            yaml = YAML(typ='safe')
-            yaml.default_flow_style = False
-            yaml.dump(metadata, metafile)
+            dump_yaml(metadata, metafile)
 
     def __enter__(self) -> Writer:
         """Open rosbag2 when entering contextmanager."""
@@ -76,7 +76,7 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
                 if subdesc.args[0] == 'string':
                     lines.append(f'  val = message.{fieldname}')
                     for idx in range(length):
-                        lines.append('  pos = (pos + 4 - 1) & -4')
+                        lines.append('  pos = (pos + 3) & -4')
                         lines.append(f'  pos += 4 + len(val[{idx}].encode()) + 1')
                     aligned = 1
                     is_stat = False
@@ -92,7 +92,7 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
                 if subdesc.args.size_cdr:
                     for _ in range(length):
                         if anext_before > anext_after:
-                            lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+                            lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
                             size = (size + anext_before - 1) & -anext_before
                         lines.append(f'  pos += {subdesc.args.size_cdr}')
                         size += subdesc.args.size_cdr
@@ -103,7 +103,7 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
                     lines.append(f'  val = message.{fieldname}')
                     for idx in range(length):
                         if anext_before > anext_after:
-                            lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+                            lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
                         lines.append(f'  pos = func(pos, val[{idx}], typestore)')
                     is_stat = False
                 aligned = align_after(subdesc)
@@ -115,14 +115,14 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
                     lines.append(f'  for val in message.{fieldname}:')
-                    lines.append('    pos = (pos + 4 - 1) & -4')
+                    lines.append('    pos = (pos + 3) & -4')
                     lines.append('    pos += 4 + len(val.encode()) + 1')
                     aligned = 1
                 else:
                     anext_before = align(subdesc)
                     if aligned < anext_before:
                         lines.append(f'  if len(message.{fieldname}):')
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                         aligned = anext_before
                     lines.append(f'  pos += len(message.{fieldname}) * {SIZEMAP[subdesc.args]}')
 
@@ -134,10 +134,10 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
                 if subdesc.args.size_cdr:
                     if aligned < anext_before <= anext_after:
                         lines.append('  if len(val):')
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append('  for _ in val:')
                     if anext_before > anext_after:
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append(f'    pos += {subdesc.args.size_cdr}')
 
                 else:
@@ -146,10 +146,10 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
                     )
                     if aligned < anext_before <= anext_after:
                         lines.append('  if len(val):')
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append('  for item in val:')
                     if anext_before > anext_after:
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append('    pos = func(pos, item, typestore)')
                 aligned = align_after(subdesc)
 
@@ -157,7 +157,7 @@ def generate_getsize_cdr(fields: list[Field]) -> tuple[CDRSerSize, int]:
             is_stat = False
 
         if fnext and aligned < (anext_before := align(fnext.descriptor)):
-            lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+            lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
             aligned = anext_before
             is_stat = False
     lines.append('  return pos')
@@ -233,7 +233,7 @@ def generate_serialize_cdr(fields: list[Field], endianess: str) -> CDRSer:
                     for idx in range(length):
                         lines.append(f'  bval = memoryview(val[{idx}].encode())')
                         lines.append('  length = len(bval) + 1')
-                        lines.append('  pos = (pos + 4 - 1) & -4')
+                        lines.append('  pos = (pos + 3) & -4')
                         lines.append(f'  pack_int32_{endianess}(rawdata, pos, length)')
                         lines.append('  pos += 4')
                         lines.append('  rawdata[pos:pos + length - 1] = bval')
@@ -254,7 +254,7 @@ def generate_serialize_cdr(fields: list[Field], endianess: str) -> CDRSer:
                 lines.append(f'  func = get_msgdef("{name}", typestore).serialize_cdr_{endianess}')
                 for idx in range(length):
                     if anext_before > anext_after:
-                        lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append(f'  pos = func(rawdata, pos, val[{idx}], typestore)')
                 aligned = align_after(subdesc)
         else:
@@ -269,7 +269,7 @@ def generate_serialize_cdr(fields: list[Field], endianess: str) -> CDRSer:
                     lines.append('  for item in val:')
                     lines.append('    bval = memoryview(item.encode())')
                     lines.append('    length = len(bval) + 1')
-                    lines.append('    pos = (pos + 4 - 1) & -4')
+                    lines.append('    pos = (pos + 3) & -4')
                     lines.append(f'    pack_int32_{endianess}(rawdata, pos, length)')
                     lines.append('    pos += 4')
                     lines.append('    rawdata[pos:pos + length - 1] = bval')
@@ -281,7 +281,7 @@ def generate_serialize_cdr(fields: list[Field], endianess: str) -> CDRSer:
                         lines.append('  val = val.byteswap()')
                     if aligned < (anext_before := align(subdesc)):
                         lines.append('  if size:')
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append('  rawdata[pos:pos + size] = val.view(numpy.uint8)')
                     lines.append('  pos += size')
                     aligned = anext_before
@@ -291,14 +291,14 @@ def generate_serialize_cdr(fields: list[Field], endianess: str) -> CDRSer:
                 name = subdesc.args.name
                 lines.append(f'  func = get_msgdef("{name}", typestore).serialize_cdr_{endianess}')
                 lines.append('  for item in val:')
-                lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                 lines.append('    pos = func(rawdata, pos, item, typestore)')
                 aligned = align_after(subdesc)
 
             aligned = min([4, aligned])
 
         if fnext and aligned < (anext_before := align(fnext.descriptor)):
-            lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+            lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
             aligned = anext_before
     lines.append('  return pos')
     return compile_lines(lines).serialize_cdr  # type: ignore
@@ -371,7 +371,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
                     lines.append('  value = []')
                     for idx in range(length):
                         if idx:
-                            lines.append('  pos = (pos + 4 - 1) & -4')
+                            lines.append('  pos = (pos + 3) & -4')
                         lines.append(f'  length = unpack_int32_{endianess}(rawdata, pos)[0]')
                         lines.append(
                             '  value.append(bytes(rawdata[pos + 4:pos + 4 + length - 1]).decode())',
@@ -397,7 +397,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
                 lines.append('  value = []')
                 for _ in range(length):
                     if anext_before > anext_after:
-                        lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append(
                         f'  obj, pos = msgdef.{funcname}(rawdata, pos, msgdef.cls, typestore)',
                     )
@@ -416,7 +416,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
                 if subdesc.args[0] == 'string':
                     lines.append('  value = []')
                     lines.append('  for _ in range(size):')
-                    lines.append('    pos = (pos + 4 - 1) & -4')
+                    lines.append('    pos = (pos + 3) & -4')
                     lines.append(f'    length = unpack_int32_{endianess}(rawdata, pos)[0]')
                     lines.append(
                         '    value.append(bytes(rawdata[pos + 4:pos + 4 + length - 1])'
@@ -429,7 +429,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
                     lines.append(f'  length = size * {SIZEMAP[subdesc.args]}')
                     if aligned < (anext_before := align(subdesc)):
                         lines.append('  if size:')
-                        lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                     lines.append(
                         f'  val = numpy.frombuffer(rawdata, '
                         f'dtype=numpy.{ndtype(subdesc.args)}, count=size, offset=pos)',
@@ -445,7 +445,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
                 lines.append(f'  msgdef = get_msgdef("{subdesc.args.name}", typestore)')
                 lines.append('  value = []')
                 lines.append('  for _ in range(size):')
-                lines.append(f'    pos = (pos + {anext_before} - 1) & -{anext_before}')
+                lines.append(f'    pos = (pos + {anext_before - 1}) & -{anext_before}')
                 lines.append(
                     f'    obj, pos = msgdef.{funcname}(rawdata, pos, msgdef.cls, typestore)',
                 )
@@ -456,7 +456,7 @@ def generate_deserialize_cdr(fields: list[Field], endianess: str) -> CDRDeser:
             aligned = min([4, aligned])
 
         if fnext and aligned < (anext_before := align(fnext.descriptor)):
-            lines.append(f'  pos = (pos + {anext_before} - 1) & -{anext_before}')
+            lines.append(f'  pos = (pos + {anext_before - 1}) & -{anext_before}')
             aligned = anext_before
 
     lines.append('  return cls(*values), pos')
@@ -41,52 +41,56 @@ def get_msgdef(typename: str, typestore: Typestore) -> Msgdef:
         Message definition.
 
     """
+    try:
+        return MSGDEFCACHE[typestore][typename]
+    except KeyError:
+        pass
+
     if typestore not in MSGDEFCACHE:
         MSGDEFCACHE[typestore] = {}
     cache = MSGDEFCACHE[typestore]
 
-    if typename not in cache:
-        entries = typestore.FIELDDEFS[typename][1]
-
-        def fixup(entry: Fielddesc) -> Descriptor:
-            if entry[0] == int(Valtype.BASE):
-                assert isinstance(entry[1], (str, tuple))
-                return Descriptor(Valtype.BASE, entry[1])
-            if entry[0] == int(Valtype.MESSAGE):
-                assert isinstance(entry[1], str)
-                return Descriptor(Valtype.MESSAGE, get_msgdef(entry[1], typestore))
-            if entry[0] == int(Valtype.ARRAY):
-                assert not isinstance(entry[1][0], str)
-                return Descriptor(Valtype.ARRAY, (fixup(entry[1][0]), entry[1][1]))
-            if entry[0] == int(Valtype.SEQUENCE):
-                assert not isinstance(entry[1][0], str)
-                return Descriptor(Valtype.SEQUENCE, (fixup(entry[1][0]), entry[1][1]))
-            raise SerdeError(  # pragma: no cover
-                f'Unknown field type {entry[0]!r} encountered.',
-            )
-
-        fields = [Field(name, fixup(desc)) for name, desc in entries]
-
-        getsize_cdr, size_cdr = generate_getsize_cdr(fields)
-        getsize_ros1, size_ros1 = generate_getsize_ros1(fields, typename)
-
-        cache[typename] = Msgdef(
-            typename,
-            fields,
-            getattr(typestore, typename.replace('/', '__')),
-            size_cdr,
-            getsize_cdr,
-            generate_serialize_cdr(fields, 'le'),
-            generate_serialize_cdr(fields, 'be'),
-            generate_deserialize_cdr(fields, 'le'),
-            generate_deserialize_cdr(fields, 'be'),
-            size_ros1,
-            getsize_ros1,
-            generate_serialize_ros1(fields, typename),
-            generate_deserialize_ros1(fields, typename),
-            generate_ros1_to_cdr(fields, typename, False),  # type: ignore
-            generate_ros1_to_cdr(fields, typename, True),  # type: ignore
-            generate_cdr_to_ros1(fields, typename, False),  # type: ignore
-            generate_cdr_to_ros1(fields, typename, True),  # type: ignore
+    entries = typestore.FIELDDEFS[typename][1]
+
+    def fixup(entry: Fielddesc) -> Descriptor:
+        if entry[0] == int(Valtype.BASE):
+            assert isinstance(entry[1], (str, tuple))
+            return Descriptor(Valtype.BASE, entry[1])
+        if entry[0] == int(Valtype.MESSAGE):
+            assert isinstance(entry[1], str)
+            return Descriptor(Valtype.MESSAGE, get_msgdef(entry[1], typestore))
+        if entry[0] == int(Valtype.ARRAY):
+            assert not isinstance(entry[1][0], str)
+            return Descriptor(Valtype.ARRAY, (fixup(entry[1][0]), entry[1][1]))
+        if entry[0] == int(Valtype.SEQUENCE):
+            assert not isinstance(entry[1][0], str)
+            return Descriptor(Valtype.SEQUENCE, (fixup(entry[1][0]), entry[1][1]))
+        raise SerdeError(  # pragma: no cover
+            f'Unknown field type {entry[0]!r} encountered.',
         )
+
+    fields = [Field(name, fixup(desc)) for name, desc in entries]
+
+    getsize_cdr, size_cdr = generate_getsize_cdr(fields)
+    getsize_ros1, size_ros1 = generate_getsize_ros1(fields, typename)
+
+    cache[typename] = Msgdef(
+        typename,
+        fields,
+        getattr(typestore, typename.replace('/', '__')),
+        size_cdr,
+        getsize_cdr,
+        generate_serialize_cdr(fields, 'le'),
+        generate_serialize_cdr(fields, 'be'),
+        generate_deserialize_cdr(fields, 'le'),
+        generate_deserialize_cdr(fields, 'be'),
+        size_ros1,
+        getsize_ros1,
+        generate_serialize_ros1(fields, typename),
+        generate_deserialize_ros1(fields, typename),
+        generate_ros1_to_cdr(fields, typename, False),  # type: ignore
+        generate_ros1_to_cdr(fields, typename, True),  # type: ignore
+        generate_cdr_to_ros1(fields, typename, False),  # type: ignore
+        generate_cdr_to_ros1(fields, typename, True),  # type: ignore
+    )
     return cache[typename]
@@ -12,8 +12,8 @@ conversion of ROS1 to CDR.
 from __future__ import annotations
 
 import sys
-from itertools import tee
-from typing import TYPE_CHECKING, Iterator, cast
+from struct import calcsize
+from typing import TYPE_CHECKING
 
 from .typing import Field
 from .utils import SIZEMAP, Valtype, align, align_after, compile_lines, ndtype
@@ -21,7 +21,161 @@ from .utils import SIZEMAP, Valtype, align, align_after, compile_lines, ndtype
 if TYPE_CHECKING:
     from typing import Union
 
-    from .typing import Bitcvt, BitcvtSize, CDRDeser, CDRSer, CDRSerSize
+    from .typing import Bitcvt, BitcvtSize, CDRDeser, CDRSer, CDRSerSize, Descriptor
+
+UNROLL_MAX = 8
+
+STRUCTCODES = {
+    'bool': '?',
+    'char': 'B',
+    'octet': 'B',
+    'int8': 'b',
+    'int16': 'h',
+    'int32': 'i',
+    'int64': 'q',
+    'uint8': 'B',
+    'uint16': 'H',
+    'uint32': 'I',
+    'uint64': 'Q',
+    'float32': 'f',
+    'float64': 'd',
+}
+
+
+def get_fixed_size(desc: Descriptor) -> int:
+    """Get size of field that is copied verbatim between ROS1 and CDR.
+
+    Args:
+        desc: Field descriptor.
+
+    Returns:
+        Size in bytes, zero if field is not a fixed size block.
+
+    """
+    if desc.valtype == Valtype.BASE:
+        return 0 if desc.args[0] == 'string' else SIZEMAP[desc.args]
+    if desc.valtype == Valtype.ARRAY:
+        subdesc, length = desc.args
+        if subdesc.valtype == Valtype.BASE and subdesc.args[0] != 'string':
+            size: int = length * SIZEMAP[subdesc.args]
+            return size
+    return 0
+
+
+def emit_copy(lines: list[str], size: int, copy: bool) -> None:
+    """Emit verbatim copy of adjacent fixed size fields.
+
+    Args:
+        lines: Generated lines.
+        size: Number of bytes to copy.
+        copy: Emit byte copy in addition to position updates.
+
+    """
+    if size:
+        if copy:
+            lines.append(f'  output[opos:opos + {size}] = input[ipos:ipos + {size}]')
+        lines.append(f'  ipos += {size}')
+        lines.append(f'  opos += {size}')
+
+
+def emit_repeated(lines: list[str], body: list[str], count: int) -> None:
+    """Emit repeated code, unrolled for few repetitions only.
+
+    Args:
+        lines: Generated lines.
+        body: Lines to repeat.
+        count: Number of repetitions.
+
+    """
+    if count > UNROLL_MAX:
+        lines.append(f'  for _ in range({count}):')
+        lines.extend(f'  {x}' for x in body)
+    else:
+        lines.extend(body * count)
+
+
+def get_scalars(fields: list[Field]) -> list[str]:
+    """Get scalar types of message that packs into a single struct.
+
+    Args:
+        fields: Fields of message.
+
+    Returns:
+        Scalar types of fields, empty if any field is not a struct scalar.
+
+    """
+    members = [x for x in fields if x.name != 'structure_needs_at_least_one_member']
+    types = [x.descriptor.args for x in members if x.descriptor.valtype == Valtype.BASE]
+    if len(types) == len(members) and all(x in STRUCTCODES for x in types):
+        return types
+    return []
+
+
+def emit_struct(structs: list[str], types: list[str], method: str) -> tuple[str, int]:
+    """Define packed struct for run of adjacent scalar fields.
+
+    Args:
+        structs: Module level struct definitions.
+        types: Scalar types of adjacent fields.
+        method: Struct method to bind, pack_into or unpack_from.
+
+    Returns:
+        Name of bound struct method and size of run in bytes.
+
+    """
+    fmt = '<' + ''.join(STRUCTCODES[x] for x in types)
+    name = f'{method.split("_")[0]}{len(structs)}'
+    structs.append(f'{name} = Struct({fmt!r}).{method}')
+    return name, calcsize(fmt)
+
+
+def emit_pack(lines: list[str], structs: list[str], run: list[Field]) -> None:
+    """Emit packing of adjacent scalar fields.
+
+    Args:
+        lines: Generated lines.
+        structs: Module level struct definitions.
+        run: Adjacent scalar fields.
+
+    """
+    if run:
+        func, size = emit_struct(structs, [x.descriptor.args for x in run], 'pack_into')
+        args = ', '.join(f'message.{x.name}' for x in run)
+        lines.append(f'  {func}(rawdata, pos, {args})')
+        lines.append(f'  pos += {size}')
+
+
+def emit_unpack(lines: list[str], structs: list[str], run: list[Field], idx: int) -> None:
+    """Emit unpacking of adjacent scalar fields.
+
+    Args:
+        lines: Generated lines.
+        structs: Module level struct definitions.
+        run: Adjacent scalar fields.
+        idx: Value index of first field in run.
+
+    """
+    if run:
+        func, size = emit_struct(structs, [x.descriptor.args for x in run], 'unpack_from')
+        if len(run) == 1:
+            lines.append(f'  values[{idx}] = {func}(rawdata, pos)[0]')
+        else:
+            lines.append(f'  values[{idx}:{idx + len(run)}] = {func}(rawdata, pos)')
+        lines.append(f'  pos += {size}')
+
+
+def hoist(hoisted: dict[str, str], expr: str) -> str:
+    """Hoist expression to start of generated function.
+
+    Args:
+        hoisted: Hoisted expressions and their local names.
+        expr: Expression to hoist.
+
+    Returns:
+        Name of local holding the value of expression.
+
+    """
+    return hoisted.setdefault(expr, f'ref{len(hoisted)}')
 
 
 def generate_ros1_to_cdr(
@@ -42,10 +196,6 @@ def generate_ros1_to_cdr(
     """
     # pylint: disable=too-many-branches,too-many-locals,too-many-nested-blocks,too-many-statements
     aligned = 8
-    iterators = tee([*fields, None])
-    icurr = cast('Iterator[Field]', iterators[0])
-    inext = iterators[1]
-    next(inext)
     funcname = 'ros1_to_cdr' if copy else 'getsize_ros1_to_cdr'
     lines = [
         'import sys',
@@ -55,20 +205,28 @@ def generate_ros1_to_cdr(
         'from rosbags.serde.primitives import unpack_int32_le',
         f'def {funcname}(input, ipos, output, opos, typestore):',
     ]
+    start = len(lines)
+    hoisted: dict[str, str] = {}
 
     if typename == 'std_msgs/msg/Header':
         lines.append('  ipos += 4')
 
-    for fcurr, fnext in zip(icurr, inext):
+    # Adjacent fixed size fields without padding are copied in one go.
+    run = 0
+    for fcurr, fnext in zip(fields, [*fields[1:], None]):
         fieldname, desc = fcurr
 
+        if fieldname == 'structure_needs_at_least_one_member' or not get_fixed_size(desc):
+            emit_copy(lines, run, copy)
+            run = 0
+
         if fieldname == 'structure_needs_at_least_one_member':
             lines.append('  opos += 1')
             aligned = 1
 
         elif desc.valtype == Valtype.MESSAGE:
-            lines.append(f'  func = get_msgdef("{desc.args.name}", typestore).{funcname}')
-            lines.append('  ipos, opos = func(input, ipos, output, opos, typestore)')
+            func = hoist(hoisted, f'get_msgdef("{desc.args.name}", typestore).{funcname}')
+            lines.append(f'  ipos, opos = {func}(input, ipos, output, opos, typestore)')
             aligned = align_after(desc)
 
         elif desc.valtype == Valtype.BASE:
@@ -85,10 +243,7 @@ def generate_ros1_to_cdr(
                 aligned = 1
             else:
                 size = SIZEMAP[desc.args]
-                if copy:
-                    lines.append(f'  output[opos:opos + {size}] = input[ipos:ipos + {size}]')
-                lines.append(f'  ipos += {size}')
-                lines.append(f'  opos += {size}')
+                run += size
                 aligned = size
 
         elif desc.valtype == Valtype.ARRAY:
@@ -96,37 +251,35 @@ def generate_ros1_to_cdr(
 
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
-                    for _ in range(length):
-                        lines.append('  opos = (opos + 4 - 1) & -4')
-                        lines.append('  length = unpack_int32_le(input, ipos)[0] + 1')
-                        if copy:
-                            lines.append('  pack_int32_le(output, opos, length)')
-                        lines.append('  ipos += 4')
-                        lines.append('  opos += 4')
-                        if copy:
-                            lines.append(
-                                '  output[opos:opos + length - 1] = input[ipos:ipos + length - 1]',
-                            )
-                        lines.append('  ipos += length - 1')
-                        lines.append('  opos += length')
+                    body = []
+                    body.append('  opos = (opos + 3) & -4')
+                    body.append('  length = unpack_int32_le(input, ipos)[0] + 1')
+                    if copy:
+                        body.append('  pack_int32_le(output, opos, length)')
+                    body.append('  ipos += 4')
+                    body.append('  opos += 4')
+                    if copy:
+                        body.append(
+                            '  output[opos:opos + length - 1] = input[ipos:ipos + length - 1]',
+                        )
+                    body.append('  ipos += length - 1')
+                    body.append('  opos += length')
+                    emit_repeated(lines, body, length)
                     aligned = 1
                 else:
-                    size = length * SIZEMAP[subdesc.args]
-                    if copy:
-                        lines.append(f'  output[opos:opos + {size}] = input[ipos:ipos + {size}]')
-                    lines.append(f'  ipos += {size}')
-                    lines.append(f'  opos += {size}')
+                    run += length * SIZEMAP[subdesc.args]
                     aligned = SIZEMAP[subdesc.args]
 
             if subdesc.valtype == Valtype.MESSAGE:
                 anext_before = align(subdesc)
                 anext_after = align_after(subdesc)
 
-                lines.append(f'  func = get_msgdef("{subdesc.args.name}", typestore).{funcname}')
-                for _ in range(length):
-                    if anext_before > anext_after:
-                        lines.append(f'  opos = (opos + {anext_before} - 1) & -{anext_before}')
-                    lines.append('  ipos, opos = func(input, ipos, output, opos, typestore)')
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                body = []
+                if anext_before > anext_after:
+                    body.append(f'  opos = (opos + {anext_before - 1}) & -{anext_before}')
+                body.append(f'  ipos, opos = {func}(input, ipos, output, opos, typestore)')
+                emit_repeated(lines, body, length)
                 aligned = anext_after
         else:
             assert desc.valtype == Valtype.SEQUENCE
@@ -142,7 +295,7 @@ def generate_ros1_to_cdr(
                 if subdesc.args[0] == 'string':
                     lines.append('  for _ in range(size):')
                     lines.append('    length = unpack_int32_le(input, ipos)[0] + 1')
-                    lines.append('    opos = (opos + 4 - 1) & -4')
+                    lines.append('    opos = (opos + 3) & -4')
                     if copy:
                         lines.append('    pack_int32_le(output, opos, length)')
                     lines.append('    ipos += 4')
@@ -157,7 +310,7 @@ def generate_ros1_to_cdr(
                 else:
                     if aligned < (anext_before := align(subdesc)):
                         lines.append('  if size:')
-                        lines.append(f'    opos = (opos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    opos = (opos + {anext_before - 1}) & -{anext_before}')
                     lines.append(f'  length = size * {SIZEMAP[subdesc.args]}')
                     if copy:
                         lines.append('  output[opos:opos + length] = input[ipos:ipos + length]')
@@ -168,18 +321,22 @@ def generate_ros1_to_cdr(
             else:
                 assert subdesc.valtype == Valtype.MESSAGE
                 anext_before = align(subdesc)
-                lines.append(f'  func = get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
                 lines.append('  for _ in range(size):')
-                lines.append(f'    opos = (opos + {anext_before} - 1) & -{anext_before}')
-                lines.append('    ipos, opos = func(input, ipos, output, opos, typestore)')
+                lines.append(f'    opos = (opos + {anext_before - 1}) & -{anext_before}')
+                lines.append(f'    ipos, opos = {func}(input, ipos, output, opos, typestore)')
                 aligned = align_after(subdesc)
 
             aligned = min([aligned, 4])
 
         if fnext and aligned < (anext_before := align(fnext.descriptor)):
-            lines.append(f'  opos = (opos + {anext_before} - 1) & -{anext_before}')
+            emit_copy(lines, run, copy)
+            run = 0
+            lines.append(f'  opos = (opos + {anext_before - 1}) & -{anext_before}')
             aligned = anext_before
 
+    emit_copy(lines, run, copy)
+    lines[start:start] = [f'  {var} = {expr}' for expr, var in hoisted.items()]
     lines.append('  return ipos, opos')
     return getattr(compile_lines(lines), funcname)  # type: ignore
 
@@ -202,10 +359,6 @@ def generate_cdr_to_ros1(
     """
     # pylint: disable=too-many-branches,too-many-locals,too-many-nested-blocks,too-many-statements
     aligned = 8
-    iterators = tee([*fields, None])
-    icurr = cast('Iterator[Field]', iterators[0])
-    inext = iterators[1]
-    next(inext)
     funcname = 'cdr_to_ros1' if copy else 'getsize_cdr_to_ros1'
     lines = [
         'import sys',
@@ -215,20 +368,28 @@ def generate_cdr_to_ros1(
         'from rosbags.serde.primitives import unpack_int32_le',
         f'def {funcname}(input, ipos, output, opos, typestore):',
     ]
+    start = len(lines)
+    hoisted: dict[str, str] = {}
 
     if typename == 'std_msgs/msg/Header':
         lines.append('  opos += 4')
 
-    for fcurr, fnext in zip(icurr, inext):
+    # Adjacent fixed size fields without padding are copied in one go.
+    run = 0
+    for fcurr, fnext in zip(fields, [*fields[1:], None]):
         fieldname, desc = fcurr
 
+        if fieldname == 'structure_needs_at_least_one_member' or not get_fixed_size(desc):
+            emit_copy(lines, run, copy)
+            run = 0
+
         if fieldname == 'structure_needs_at_least_one_member':
             lines.append('  ipos += 1')
             aligned = 1
 
         elif desc.valtype == Valtype.MESSAGE:
-            lines.append(f'  func = get_msgdef("{desc.args.name}", typestore).{funcname}')
-            lines.append('  ipos, opos = func(input, ipos, output, opos, typestore)')
+            func = hoist(hoisted, f'get_msgdef("{desc.args.name}", typestore).{funcname}')
+            lines.append(f'  ipos, opos = {func}(input, ipos, output, opos, typestore)')
             aligned = align_after(desc)
 
         elif desc.valtype == Valtype.BASE:
@@ -245,10 +406,7 @@ def generate_cdr_to_ros1(
                 aligned = 1
             else:
                 size = SIZEMAP[desc.args]
-                if copy:
-                    lines.append(f'  output[opos:opos + {size}] = input[ipos:ipos + {size}]')
-                lines.append(f'  ipos += {size}')
-                lines.append(f'  opos += {size}')
+                run += size
                 aligned = size
 
         elif desc.valtype == Valtype.ARRAY:
@@ -256,37 +414,33 @@ def generate_cdr_to_ros1(
 
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
-                    for _ in range(length):
-                        lines.append('  ipos = (ipos + 4 - 1) & -4')
-                        lines.append('  length = unpack_int32_le(input, ipos)[0] - 1')
-                        if copy:
-                            lines.append('  pack_int32_le(output, opos, length)')
-                        lines.append('  ipos += 4')
-                        lines.append('  opos += 4')
-                        if copy:
-                            lines.append(
-                                '  output[opos:opos + length] = input[ipos:ipos + length]',
-                            )
-                        lines.append('  ipos += length + 1')
-                        lines.append('  opos += length')
+                    body = []
+                    body.append('  ipos = (ipos + 3) & -4')
+                    body.append('  length = unpack_int32_le(input, ipos)[0] - 1')
+                    if copy:
+                        body.append('  pack_int32_le(output, opos, length)')
+                    body.append('  ipos += 4')
+                    body.append('  opos += 4')
+                    if copy:
+                        body.append('  output[opos:opos + length] = input[ipos:ipos + length]')
+                    body.append('  ipos += length + 1')
+                    body.append('  opos += length')
+                    emit_repeated(lines, body, length)
                     aligned = 1
                 else:
-                    size = length * SIZEMAP[subdesc.args]
-                    if copy:
-                        lines.append(f'  output[opos:opos + {size}] = input[ipos:ipos + {size}]')
-                    lines.append(f'  ipos += {size}')
-                    lines.append(f'  opos += {size}')
+                    run += length * SIZEMAP[subdesc.args]
                     aligned = SIZEMAP[subdesc.args]
 
             if subdesc.valtype == Valtype.MESSAGE:
                 anext_before = align(subdesc)
                 anext_after = align_after(subdesc)
 
-                lines.append(f'  func = get_msgdef("{subdesc.args.name}", typestore).{funcname}')
-                for _ in range(length):
-                    if anext_before > anext_after:
-                        lines.append(f'  ipos = (ipos + {anext_before} - 1) & -{anext_before}')
-                    lines.append('  ipos, opos = func(input, ipos, output, opos, typestore)')
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                body = []
+                if anext_before > anext_after:
+                    body.append(f'  ipos = (ipos + {anext_before - 1}) & -{anext_before}')
+                body.append(f'  ipos, opos = {func}(input, ipos, output, opos, typestore)')
+                emit_repeated(lines, body, length)
                 aligned = anext_after
         else:
             assert desc.valtype == Valtype.SEQUENCE
@@ -301,7 +455,7 @@ def generate_cdr_to_ros1(
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
                     lines.append('  for _ in range(size):')
-                    lines.append('    ipos = (ipos + 4 - 1) & -4')
+                    lines.append('    ipos = (ipos + 3) & -4')
                     lines.append('    length = unpack_int32_le(input, ipos)[0] - 1')
                     if copy:
                         lines.append('    pack_int32_le(output, opos, length)')
@@ -315,7 +469,7 @@ def generate_cdr_to_ros1(
                 else:
                     if aligned < (anext_before := align(subdesc)):
                         lines.append('  if size:')
-                        lines.append(f'    ipos = (ipos + {anext_before} - 1) & -{anext_before}')
+                        lines.append(f'    ipos = (ipos + {anext_before - 1}) & -{anext_before}')
                     lines.append(f'  length = size * {SIZEMAP[subdesc.args]}')
                     if copy:
                         lines.append('  output[opos:opos + length] = input[ipos:ipos + length]')
@@ -326,18 +480,22 @@ def generate_cdr_to_ros1(
             else:
                 assert subdesc.valtype == Valtype.MESSAGE
                 anext_before = align(subdesc)
-                lines.append(f'  func = get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
                 lines.append('  for _ in range(size):')
-                lines.append(f'    ipos = (ipos + {anext_before} - 1) & -{anext_before}')
-                lines.append('    ipos, opos = func(input, ipos, output, opos, typestore)')
+                lines.append(f'    ipos = (ipos + {anext_before - 1}) & -{anext_before}')
+                lines.append(f'    ipos, opos = {func}(input, ipos, output, opos, typestore)')
                 aligned = align_after(subdesc)
 
             aligned = min([aligned, 4])
 
         if fnext and aligned < (anext_before := align(fnext.descriptor)):
-            lines.append(f'  ipos = (ipos + {anext_before} - 1) & -{anext_before}')
+            emit_copy(lines, run, copy)
+            run = 0
+            lines.append(f'  ipos = (ipos + {anext_before - 1}) & -{anext_before}')
             aligned = anext_before
 
+    emit_copy(lines, run, copy)
+    lines[start:start] = [f'  {var} = {expr}' for expr, var in hoisted.items()]
     lines.append('  return ipos, opos')
     return getattr(compile_lines(lines), funcname)  # type: ignore
 
@@ -362,6 +520,8 @@ def generate_getsize_ros1(fields: list[Field], typename: str) -> tuple[CDRSerSiz
         'from rosbags.serde.messages import get_msgdef',
         'def getsize_ros1(pos, message, typestore):',
     ]
+    start = len(lines)
+    hoisted: dict[str, str] = {}
 
     if typename == 'std_msgs/msg/Header':
         lines.append('  pos += 4')
@@ -377,8 +537,8 @@ def generate_getsize_ros1(fields: list[Field], typename: str) -> tuple[CDRSerSiz
                 lines.append(f'  pos += {desc.args.size_ros1}')
                 size += desc.args.size_ros1
             else:
-                lines.append(f'  func = get_msgdef("{desc.args.name}", typestore).getsize_ros1')
-                lines.append(f'  pos = func(pos, message.{fieldname}, typestore)')
+                func = hoist(hoisted, f'get_msgdef("{desc.args.name}", typestore).getsize_ros1')
+                lines.append(f'  pos = {func}(pos, message.{fieldname}, typestore)')
                 is_stat = False
 
         elif desc.valtype == Valtype.BASE:
@@ -409,12 +569,13 @@ def generate_getsize_ros1(fields: list[Field], typename: str) -> tuple[CDRSerSiz
                         lines.append(f'  pos += {subdesc.args.size_ros1}')
                         size += subdesc.args.size_ros1
                 else:
-                    lines.append(
-                        f'  func = get_msgdef("{subdesc.args.name}", typestore).getsize_ros1',
+                    func = hoist(
+                        hoisted,
+                        f'get_msgdef("{subdesc.args.name}", typestore).getsize_ros1',
                     )
                     lines.append(f'  val = message.{fieldname}')
                     for idx in range(length):
-                        lines.append(f'  pos = func(pos, val[{idx}], typestore)')
+                        lines.append(f'  pos = {func}(pos, val[{idx}], typestore)')
                     is_stat = False
         else:
             assert desc.valtype == Valtype.SEQUENCE
@@ -434,13 +595,15 @@ def generate_getsize_ros1(fields: list[Field], typename: str) -> tuple[CDRSerSiz
                     lines.append(f'  pos += {subdesc.args.size_ros1} * len(val)')
 
                 else:
-                    lines.append(
-                        f'  func = get_msgdef("{subdesc.args.name}", typestore).getsize_ros1',
+                    func = hoist(
+                        hoisted,
+                        f'get_msgdef("{subdesc.args.name}", typestore).getsize_ros1',
                     )
                     lines.append('  for item in val:')
-                    lines.append('    pos = func(pos, item, typestore)')
+                    lines.append(f'    pos = {func}(pos, item, typestore)')
 
             is_stat = False
+    lines[start:start] = [f'  {var} = {expr}' for expr, var in hoisted.items()]
     lines.append('  return pos')
     return compile_lines(lines).getsize_ros1, is_stat * size
 
@@ -460,50 +623,49 @@ def generate_serialize_ros1(fields: list[Field], typename: str) -> CDRSer:
     lines = [
         'import sys',
         'import numpy',
+        'from struct import Struct',
         'from rosbags.serde.messages import SerdeError, get_msgdef',
-        'from rosbags.serde.primitives import pack_bool_le',
-        'from rosbags.serde.primitives import pack_octet_le',
-        'from rosbags.serde.primitives import pack_int8_le',
-        'from rosbags.serde.primitives import pack_int16_le',
         'from rosbags.serde.primitives import pack_int32_le',
-        'from rosbags.serde.primitives import pack_int64_le',
-        'from rosbags.serde.primitives import pack_uint8_le',
-        'from rosbags.serde.primitives import pack_uint16_le',
-        'from rosbags.serde.primitives import pack_uint32_le',
-        'from rosbags.serde.primitives import pack_uint64_le',
-        'from rosbags.serde.primitives import pack_float32_le',
-        'from rosbags.serde.primitives import pack_float64_le',
         'def serialize_ros1(rawdata, pos, message, typestore):',
     ]
+    start = len(lines)
+    hoisted: dict[str, str] = {}
+    structs: list[str] = []
 
     if typename == 'std_msgs/msg/Header':
         lines.append('  pos += 4')
 
     be_syms = ('>',) if sys.byteorder == 'little' else ('=', '>')
 
+    # Adjacent scalar fields are packed with a single struct call.
+    run: list[Field] = []
     for fcurr in fields:
         fieldname, desc = fcurr
 
         if fieldname == 'structure_needs_at_least_one_member':
             continue
 
+        if desc.valtype == Valtype.BASE and desc.args in STRUCTCODES:
+            run.append(fcurr)
+            continue
+
+        emit_pack(lines, structs, run)
+        run = []
+
         lines.append(f'  val = message.{fieldname}')
         if desc.valtype == Valtype.MESSAGE:
             name = desc.args.name
-            lines.append(f'  func = get_msgdef("{name}", typestore).serialize_ros1')
-            lines.append('  pos = func(rawdata, pos, val, typestore)')
+            func = hoist(hoisted, f'get_msgdef("{name}", typestore).serialize_ros1')
+            lines.append(f'  pos = {func}(rawdata, pos, val, typestore)')
 
         elif desc.valtype == Valtype.BASE:
-            if desc.args[0] == 'string':
-                lines.append('  bval = memoryview(val.encode())')
-                lines.append('  length = len(bval)')
-                lines.append('  pack_int32_le(rawdata, pos, length)')
-                lines.append('  pos += 4')
-                lines.append('  rawdata[pos:pos + length] = bval')
-                lines.append('  pos += length')
-            else:
-                lines.append(f'  pack_{desc.args}_le(rawdata, pos, val)')
-                lines.append(f'  pos += {SIZEMAP[desc.args]}')
+            assert desc.args[0] == 'string'
+            lines.append('  bval = val.encode()')
+            lines.append('  length = len(bval)')
+            lines.append('  pack_int32_le(rawdata, pos, length)')
+            lines.append('  pos += 4')
+            lines.append('  rawdata[pos:pos + length] = bval')
+            lines.append('  pos += length')
 
         elif desc.valtype == Valtype.ARRAY:
             subdesc, length = desc.args
@@ -513,25 +675,29 @@ def generate_serialize_ros1(fields: list[Field], typename: str) -> CDRSer:
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
                     for idx in range(length):
-                        lines.append(f'  bval = memoryview(val[{idx}].encode())')
+                        lines.append(f'  bval = val[{idx}].encode()')
                         lines.append('  length = len(bval)')
                         lines.append('  pack_int32_le(rawdata, pos, length)')
                         lines.append('  pos += 4')
                         lines.append('  rawdata[pos:pos + length] = bval')
                         lines.append('  pos += length')
                 else:
-                    lines.append(f'  if val.dtype.byteorder in {be_syms}:')
-                    lines.append('    val = val.byteswap()')
                     size = length * SIZEMAP[subdesc.args]
                     lines.append(f'  rawdata[pos:pos + {size}] = val.view(numpy.uint8)')
+                    if SIZEMAP[subdesc.args] > 1:
+                        lines.append(f'  if val.dtype.byteorder in {be_syms}:')
+                        lines.append(
+                            f'    numpy.frombuffer(rawdata, dtype=val.dtype, count={length}, '
+                            'offset=pos).byteswap(inplace=True)',
+                        )
                     lines.append(f'  pos += {size}')
 
             else:
                 assert subdesc.valtype == Valtype.MESSAGE
                 name = subdesc.args.name
-                lines.append(f'  func = get_msgdef("{name}", typestore).serialize_ros1')
+                func = hoist(hoisted, f'get_msgdef("{name}", typestore).serialize_ros1')
                 for idx in range(length):
-                    lines.append(f'  pos = func(rawdata, pos, val[{idx}], typestore)')
+                    lines.append(f'  pos = {func}(rawdata, pos, val[{idx}], typestore)')
         else:
             assert desc.valtype == Valtype.SEQUENCE
             lines.append('  pack_int32_le(rawdata, pos, len(val))')
@@ -541,7 +707,7 @@ def generate_serialize_ros1(fields: list[Field], typename: str) -> CDRSer:
             if subdesc.valtype == Valtype.BASE:
                 if subdesc.args[0] == 'string':
                     lines.append('  for item in val:')
-                    lines.append('    bval = memoryview(item.encode())')
+                    lines.append('    bval = item.encode()')
                     lines.append('    length = len(bval)')
                     lines.append('    pack_int32_le(rawdata, pos, length)')
                     lines.append('    pos += 4')
@@ -549,17 +715,24 @@ def generate_serialize_ros1(fields: list[Field], typename: str) -> CDRSer:
                     lines.append('    pos += length')
                 else:
                     lines.append(f'  size = len(val) * {SIZEMAP[subdesc.args]}')
-                    lines.append(f'  if val.dtype.byteorder in {be_syms}:')
-                    lines.append('    val = val.byteswap()')
                     lines.append('  rawdata[pos:pos + size] = val.view(numpy.uint8)')
+                    if SIZEMAP[subdesc.args] > 1:
+                        lines.append(f'  if val.dtype.byteorder in {be_syms}:')
+                        lines.append(
+                            '    numpy.frombuffer(rawdata, dtype=val.dtype, count=len(val), '
+                            'offset=pos).byteswap(inplace=True)',
+                        )
                     lines.append('  pos += size')
 
             if subdesc.valtype == Valtype.MESSAGE:
                 name = subdesc.args.name
-                lines.append(f'  func = get_msgdef("{name}", typestore).serialize_ros1')
+                func = hoist(hoisted, f'get_msgdef("{name}", typestore).serialize_ros1')
                 lines.append('  for item in val:')
-                lines.append('    pos = func(rawdata, pos, item, typestore)')
+                lines.append(f'    pos = {func}(rawdata, pos, item, typestore)')
 
+    emit_pack(lines, structs, run)
+    lines[start:start] = [f'  {var} = {expr}' for expr, var in hoisted.items()]
+    lines[start - 1:start - 1] = structs
     lines.append('  return pos')
     return compile_lines(lines).serialize_ros1  # type: ignore
 
@@ -579,50 +752,52 @@ def generate_deserialize_ros1(fields: list[Field], typename: str) -> CDRDeser:
     lines = [
         'import sys',
         'import numpy',
+        'from struct import Struct',
         'from rosbags.serde.messages import SerdeError, get_msgdef',
-        'from rosbags.serde.primitives import unpack_bool_le',
-        'from rosbags.serde.primitives import unpack_octet_le',
-        'from rosbags.serde.primitives import unpack_int8_le',
-        'from rosbags.serde.primitives import unpack_int16_le',
         'from rosbags.serde.primitives import unpack_int32_le',
-        'from rosbags.serde.primitives import unpack_int64_le',
-        'from rosbags.serde.primitives import unpack_uint8_le',
-        'from rosbags.serde.primitives import unpack_uint16_le',
-        'from rosbags.serde.primitives import unpack_uint32_le',
-        'from rosbags.serde.primitives import unpack_uint64_le',
-        'from rosbags.serde.primitives import unpack_float32_le',
-        'from rosbags.serde.primitives import unpack_float64_le',
         'def deserialize_ros1(rawdata, pos, cls, typestore):',
     ]
+    start = len(lines)
+    hoisted: dict[str, str] = {}
+    structs: list[str] = []
 
     if typename == 'std_msgs/msg/Header':
         lines.append('  pos += 4')
 
-    be_syms = ('>',) if sys.byteorder == 'little' else ('=', '>')
-
     funcname = 'deserialize_ros1'
-    lines.append('  values = []')
-    for fcurr in fields:
+    members = [x for x in fields if x.name != 'structure_needs_at_least_one_member']
+    if scalars := get_scalars(fields):
+        func, size = emit_struct(structs, scalars, 'unpack_from')
+        lines[start - 1:start - 1] = structs
+        lines.append(f'  return cls(*{func}(rawdata, pos)), pos + {size}')
+        return compile_lines(lines).deserialize_ros1  # type: ignore
+
+    lines.append(f'  values = [None] * {len(members)}')
+
+    # Adjacent scalar fields are unpacked with a single struct call.
+    run: list[Field] = []
+    for idx, fcurr in enumerate(members):
         fieldname, desc = fcurr
 
-        if fieldname == 'structure_needs_at_least_one_member':
+        if desc.valtype == Valtype.BASE and desc.args in STRUCTCODES:
+            run.append(fcurr)
             continue
 
+        emit_unpack(lines, structs, run, idx - len(run))
+        run = []
+
         if desc.valtype == Valtype.MESSAGE:
-            lines.append(f'  msgdef = get_msgdef("{desc.args.name}", typestore)')
-            lines.append(f'  obj, pos = msgdef.{funcname}(rawdata, pos, msgdef.cls, typestore)')
-            lines.append('  values.append(obj)')
+            func = hoist(hoisted, f'get_msgdef("{desc.args.name}", typestore).{funcname}')
+            mcls = hoist(hoisted, f'get_msgdef("{desc.args.name}", typestore).cls')
+            lines.append(f'  obj, pos = {func}(rawdata, pos, {mcls}, typestore)')
+            lines.append(f'  values[{idx}] = obj')
 
         elif desc.valtype == Valtype.BASE:
-            if desc.args[0] == 'string':
-                lines.append('  length = unpack_int32_le(rawdata, pos)[0]')
-                lines.append('  string = bytes(rawdata[pos + 4:pos + 4 + length]).decode()')
-                lines.append('  values.append(string)')
-                lines.append('  pos += 4 + length')
-            else:
-                lines.append(f'  value = unpack_{desc.args}_le(rawdata, pos)[0]')
-                lines.append('  values.append(value)')
-                lines.append(f'  pos += {SIZEMAP[desc.args]}')
+            assert desc.args[0] == 'string'
+            lines.append('  length = unpack_int32_le(rawdata, pos)[0]')
+            lines.append("  string = str(rawdata[pos + 4:pos + 4 + length], 'utf-8')")
+            lines.append(f'  values[{idx}] = string')
+            lines.append('  pos += 4 + length')
 
         elif desc.valtype == Valtype.ARRAY:
             subdesc, length = desc.args
@@ -632,30 +807,35 @@ def generate_deserialize_ros1(fields: list[Field], typename: str) -> CDRDeser:
                     for _ in range(length):
                         lines.append('  length = unpack_int32_le(rawdata, pos)[0]')
                         lines.append(
-                            '  value.append(bytes(rawdata[pos + 4:pos + 4 + length]).decode())',
+                            "  value.append(str(rawdata[pos + 4:pos + 4 + length], 'utf-8'))",
                         )
                         lines.append('  pos += 4 + length')
-                    lines.append('  values.append(value)')
+                    lines.append(f'  values[{idx}] = value')
                 else:
                     size = length * SIZEMAP[subdesc.args]
                     lines.append(
                         f'  val = numpy.frombuffer(rawdata, '
                         f'dtype=numpy.{ndtype(subdesc.args)}, count={length}, offset=pos)',
                     )
-                    lines.append(f'  if val.dtype.byteorder in {be_syms}:')
-                    lines.append('    val = val.byteswap()')
-                    lines.append('  values.append(val)')
+                    if sys.byteorder != 'little' and SIZEMAP[subdesc.args] > 1:
+                        lines.append('  val = val.byteswap()')
+                    lines.append(f'  values[{idx}] = val')
                     lines.append(f'  pos += {size}')
+            elif scalars := get_scalars(subdesc.args.fields):
+                func, size = emit_struct(structs, scalars, 'iter_unpack')
+                mcls = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).cls')
+                lines.append(f'  view = memoryview(rawdata)[pos:pos + {length * size}]')
+                lines.append(f'  values[{idx}] = [{mcls}(*x) for x in {func}(view)]')
+                lines.append(f'  pos += {length * size}')
             else:
                 assert subdesc.valtype == Valtype.MESSAGE
-                lines.append(f'  msgdef = get_msgdef("{subdesc.args.name}", typestore)')
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                mcls = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).cls')
                 lines.append('  value = []')
                 for _ in range(length):
-                    lines.append(
-                        f'  obj, pos = msgdef.{funcname}(rawdata, pos, msgdef.cls, typestore)',
-                    )
+                    lines.append(f'  obj, pos = {func}(rawdata, pos, {mcls}, typestore)')
                     lines.append('  value.append(obj)')
-                lines.append('  values.append(value)')
+                lines.append(f'  values[{idx}] = value')
 
         else:
             assert desc.valtype == Valtype.SEQUENCE
@@ -669,31 +849,41 @@ def generate_deserialize_ros1(fields: list[Field], typename: str) -> CDRDeser:
                     lines.append('  for _ in range(size):')
                     lines.append('    length = unpack_int32_le(rawdata, pos)[0]')
                     lines.append(
-                        '    value.append(bytes(rawdata[pos + 4:pos + 4 + length])'
-                        '.decode())',
+                        "    value.append(str(rawdata[pos + 4:pos + 4 + length], 'utf-8'))",
                     )
                     lines.append('    pos += 4 + length')
-                    lines.append('  values.append(value)')
+                    lines.append(f'  values[{idx}] = value')
                 else:
                     lines.append(f'  length = size * {SIZEMAP[subdesc.args]}')
                     lines.append(
                         f'  val = numpy.frombuffer(rawdata, '
                         f'dtype=numpy.{ndtype(subdesc.args)}, count=size, offset=pos)',
                     )
-                    lines.append(f'  if val.dtype.byteorder in {be_syms}:')
-                    lines.append('    val = val.byteswap()')
-                    lines.append('  values.append(val)')
+                    if sys.byteorder != 'little' and SIZEMAP[subdesc.args] > 1:
+                        lines.append('  val = val.byteswap()')
+                    lines.append(f'  values[{idx}] = val')
                     lines.append('  pos += length')
 
-            if subdesc.valtype == Valtype.MESSAGE:
-                lines.append(f'  msgdef = get_msgdef("{subdesc.args.name}", typestore)')
+            elif scalars := get_scalars(subdesc.args.fields):
+                func, size = emit_struct(structs, scalars, 'iter_unpack')
+                mcls = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).cls')
+                lines.append(f'  length = size * {size}')
+                lines.append('  view = memoryview(rawdata)[pos:pos + length]')
+                lines.append(f'  values[{idx}] = [{mcls}(*x) for x in {func}(view)]')
+                lines.append('  pos += length')
+
+            else:
+                assert subdesc.valtype == Valtype.MESSAGE
+                func = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).{funcname}')
+                mcls = hoist(hoisted, f'get_msgdef("{subdesc.args.name}", typestore).cls')
                 lines.append('  value = []')
                 lines.append('  for _ in range(size):')
-                lines.append(
-                    f'    obj, pos = msgdef.{funcname}(rawdata, pos, msgdef.cls, typestore)',
-                )
+                lines.append(f'    obj, pos = {func}(rawdata, pos, {mcls}, typestore)')
                 lines.append('    value.append(obj)')
-                lines.append('  values.append(value)')
+                lines.append(f'  values[{idx}] = value')
 
+    emit_unpack(lines, structs, run, len(members) - len(run))
+    lines[start:start] = [f'  {var} = {expr}' for expr, var in hoisted.items()]
+    lines[start - 1:start - 1] = structs
     lines.append('  return cls(*values), pos')
     return compile_lines(lines).deserialize_ros1  # type: ignore
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import sys
-from struct import pack_into
+from struct import Struct
 from typing import TYPE_CHECKING
 
 from rosbags.typesys import types
@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 
     from rosbags.typesys.register import Typestore
 
+CDR_HEADER_LE = b'\x00\x01\x00\x00'
+pack_cdr_header = Struct('BB').pack_into
+
 
 def deserialize_cdr(
     rawdata: bytes,
@@ -73,7 +76,7 @@ def serialize_cdr(
     msgdef = get_msgdef(typename, typestore)
     size = 4 + msgdef.getsize_cdr(0, message, typestore)
     rawdata = memoryview(bytearray(size))
-    pack_into('BB', rawdata, 0, 0, little_endian)
+    pack_cdr_header(rawdata, 0, 0, little_endian)
 
     func = msgdef.serialize_cdr_le if little_endian else msgdef.serialize_cdr_be
 
@@ -89,6 +92,10 @@ def deserialize_ros1(
 ) -> Any:  # noqa: ANN401
     """Deserialize raw data into a message object.
 
+    On little-endian hosts arrays of primitive types are zero-copy numpy
+    views into rawdata. They are only writeable if rawdata is, and must not
+    outlive modifications of the underlying buffer.
+
     Args:
         rawdata: Serialized data.
         typename: Message type name.
@@ -153,6 +160,11 @@ def ros1_to_cdr(raw: bytes, typename: str, typestore: Typestore = types) -> memo
     """
     msgdef = get_msgdef(typename, typestore)
 
+    if msgdef.size_cdr and msgdef.size_cdr == msgdef.size_ros1:
+        # Static message without padding, layouts are identical.
+        assert len(raw) == msgdef.size_ros1
+        return memoryview(CDR_HEADER_LE + raw)
+
     ipos, opos = msgdef.getsize_ros1_to_cdr(
         raw,
         0,
@@ -165,7 +177,7 @@ def ros1_to_cdr(raw: bytes, typename: str, typestore: Typestore = types) -> memo
     raw = memoryview(raw)
     size = 4 + opos
     rawdata = memoryview(bytearray(size))
-    pack_into('BB', rawdata, 0, 0, True)
+    rawdata[:4] = CDR_HEADER_LE
 
     ipos, opos = msgdef.ros1_to_cdr(
         raw,
@@ -198,6 +210,11 @@ def cdr_to_ros1(raw: bytes, typename: str, typestore: Typestore = types) -> memo
 
     msgdef = get_msgdef(typename, typestore)
 
+    if msgdef.size_cdr and msgdef.size_cdr == msgdef.size_ros1:
+        # Static message without padding, layouts are identical.
+        assert msgdef.size_cdr + 4 <= len(raw) <= msgdef.size_cdr + 4 + 3
+        return memoryview(raw)[4:4 + msgdef.size_cdr].toreadonly()
+
     ipos, opos = msgdef.getsize_cdr_to_ros1(
         raw[4:],
         0,
@@ -5,11 +5,12 @@
 from __future__ import annotations
 
 from enum import IntEnum
+from functools import lru_cache
 from importlib.util import module_from_spec, spec_from_loader
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from types import ModuleType
+    from types import CodeType, ModuleType
 
     from .typing import Descriptor
 
@@ -85,9 +86,25 @@ def align_after(entry: Descriptor) -> int:
     return min([4, align_after(entry.args[0])])
 
 
+@lru_cache(maxsize=4096)
+def compile_source(source: str) -> CodeType:
+    """Compile python source, reusing code objects for identical sources.
+
+    Args:
+        source: Python source code.
+
+    Returns:
+        Compiled code object.
+
+    """
+    return compile(source, '<string>', 'exec')
+
+
 def compile_lines(lines: list[str]) -> ModuleType:
     """Compile lines of code to module.
 
+    Each call loads the code into a fresh module namespace.
+
     Args:
         lines: Lines of python code.
 
@@ -98,7 +115,7 @@ def compile_lines(lines: list[str]) -> ModuleType:
     spec = spec_from_loader('tmpmod', loader=None)
     assert spec
     module = module_from_spec(spec)
-    exec('\n'.join(lines), module.__dict__)  # pylint: disable=exec-used
+    exec(compile_source('\n'.join(lines)), module.__dict__)  # pylint: disable=exec-used
     return module
 
 
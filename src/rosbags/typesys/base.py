@@ -4,7 +4,6 @@
 
 from __future__ import annotations
 
-import json
 import keyword
 from enum import IntEnum, auto
 from hashlib import sha256
@@ -25,6 +24,9 @@ if TYPE_CHECKING:
     Typesdict = Dict[str, Tuple[Constdefs, Fielddefs]]
 
 
+KEYWORDS = frozenset(keyword.kwlist)
+
+
 class TypesysError(Exception):
     """Parser error."""
 
@@ -67,7 +69,7 @@ def normalize_fieldname(name: str) -> str:
         Normalized name.
 
     """
-    if keyword.iskeyword(name):
+    if name in KEYWORDS:
         return f'{name}_'
     return name
 
@@ -124,6 +126,9 @@ TIDMAP = {
 def hash_rihs01(typ: str, typestore: Typestore) -> str:
     """Hash message definition.
 
+    The canonical JSON description is formatted directly, all names are
+    plain identifiers that need no escaping.
+
     Args:
         typ: Message type name.
         typestore: Message type store.
@@ -133,7 +138,7 @@ def hash_rihs01(typ: str, typestore: Typestore) -> str:
 
     """
 
-    def get_field(name: str, desc: Fielddesc) -> dict[str, Any]:
+    def get_field(name: str, desc: Fielddesc) -> str:
         increment = 0
         capacity = 0
         string_capacity = 0
@@ -170,33 +175,28 @@ def hash_rihs01(typ: str, typestore: Typestore) -> str:
             else:
                 tid = increment + TIDMAP[rest]
 
-        return {
-            'name': name,
-            'type': {
-                'type_id': tid,
-                'capacity': capacity,
-                'string_capacity': string_capacity,
-                'nested_type_name': subtype,
-            },
-        }
+        return (
+            f'{{"name": "{name}", "type": {{"type_id": {tid}, "capacity": {capacity}, '
+            f'"string_capacity": {string_capacity}, "nested_type_name": "{subtype}"}}}}'
+        )
 
-    struct_cache = {}
+    struct_cache: dict[str, str] = {}
 
-    def get_struct(typ: str) -> dict[str, Any]:
+    def get_struct(typ: str) -> str:
         if typ not in struct_cache:
-            struct_cache[typ] = {
-                'type_name': typ,
-                'fields': [
-                    get_field(x, y) for x, y in typestore.FIELDDEFS[typ][1] or
-                    [('structure_needs_at_least_one_member', (1, 'uint8'))]
-                ],
-            }
+            fields = ', '.join(
+                get_field(x, y) for x, y in typestore.FIELDDEFS[typ][1] or
+                [('structure_needs_at_least_one_member', (1, 'uint8'))]
+            )
+            struct_cache[typ] = f'{{"type_name": "{typ}", "fields": [{fields}]}}'
         return struct_cache[typ]
 
-    dct = {
-        'type_description': get_struct(typ),
-        'referenced_type_descriptions': [y for x, y in sorted(struct_cache.items()) if x != typ],
-    }
+    description = get_struct(typ)
+    references = ', '.join(y for x, y in sorted(struct_cache.items()) if x != typ)
+    text = (
+        f'{{"type_description": {description}, '
+        f'"referenced_type_descriptions": [{references}]}}'
+    )
 
-    digest = sha256(json.dumps(dct).encode()).hexdigest()
+    digest = sha256(text.encode()).hexdigest()
     return f'RIHS01_{digest}'
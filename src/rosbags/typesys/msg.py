@@ -13,12 +13,18 @@ Rosbag1 connection information.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from hashlib import md5
-from pathlib import PurePosixPath as Path
 from typing import TYPE_CHECKING
 
 from . import types
-from .base import Nodetype, TypesysError, normalize_fieldname, parse_message_definition
+from .base import (
+    Nodetype,
+    TypesysError,
+    hash_rihs01,
+    normalize_fieldname,
+    parse_message_definition,
+)
 from .peg import Rule, Visitor, parse_grammar
 
 if TYPE_CHECKING:
@@ -143,25 +149,24 @@ def normalize_msgtype(name: str) -> str:
         Normalized name.
 
     """
-    path = Path(name)
-    if path.parent.name != 'msg':
-        path = path.parent / 'msg' / path.name
-    return str(path)
+    pkg, _, base = name.rpartition('/')
+    if pkg.rpartition('/')[2] == 'msg':
+        return name
+    return f'{pkg}/msg/{base}' if pkg else f'msg/{base}'
 
 
-def normalize_fieldtype(typename: str, field: Fielddesc, names: list[str]) -> Fielddesc:
+def normalize_fieldtype(typename: str, field: Fielddesc, names: dict[str, str]) -> Fielddesc:
     """Normalize field typename.
 
     Args:
         typename: Type name of field owner.
         field: Field definition.
-        names: Valid message names.
+        names: Valid message names, keyed by their short names.
 
     Returns:
         Normalized fieldtype.
 
     """
-    dct = {Path(name).name: name for name in names}
     ftype, args = field
     name = args if ftype == int(Nodetype.NAME) else args[0][1]
 
@@ -170,14 +175,15 @@ def normalize_fieldtype(typename: str, field: Fielddesc, names: list[str]) -> Fi
         ifield = (Nodetype.BASE, name)
     else:
         assert isinstance(name, str)
-        if name in dct:
-            name = dct[name]
+        if name in names:
+            name = names[name]
         elif name == 'Header':
             name = 'std_msgs/msg/Header'
         elif '/' not in name:
-            name = str(Path(typename).parent / name)
+            name = f'{typename.rsplit("/", 1)[0]}/{name}'
         elif '/msg/' not in name:
-            name = str((path := Path(name)).parent / 'msg' / path.name)
+            pkg, name = name.rsplit('/', 1)
+            name = f'{pkg}/msg/{name}'
         ifield = (Nodetype.NAME, name)
 
     if ftype == int(Nodetype.NAME):
@@ -198,7 +204,8 @@ def denormalize_msgtype(typename: str) -> str:
 
     """
     assert '/msg/' in typename
-    return str((path := Path(typename)).parent.parent / path.name)
+    pkg, _, base = typename.rsplit('/', 2)
+    return f'{pkg}/{base}'
 
 
 class VisitorMSG(Visitor):
@@ -206,7 +213,7 @@ class VisitorMSG(Visitor):
 
     RULES = parse_grammar(GRAMMAR_MSG, re.compile(r'(\s|#[^\n]*$)+', re.M | re.S))
 
-    BASETYPES = {
+    BASETYPES = frozenset({
         'bool',
         'octet',
         'int8',
@@ -220,6 +227,14 @@ class VisitorMSG(Visitor):
         'float32',
         'float64',
         'string',
+    })
+
+    ALIASES: dict[str, Union[str, tuple[str, int]]] = {
+        'time': 'builtin_interfaces/msg/Time',
+        'duration': 'builtin_interfaces/msg/Duration',
+        'byte': 'octet',
+        'char': 'uint8',
+        'string': ('string', 0),
     }
 
     def visit_const_dcl(
@@ -244,7 +259,7 @@ class VisitorMSG(Visitor):
         """Process start symbol."""
         typelist = [children[0], *[x[1] for x in children[1]]]
         typedict = dict(typelist)
-        names = list(typedict.keys())
+        names = {x.rsplit('/', 1)[-1]: x for x in typedict}
         res: Typesdict = {}
         for name, items in typedict.items():
             consts: Constdefs = [
@@ -305,14 +320,7 @@ class VisitorMSG(Visitor):
             return Nodetype.NAME, (children[0][1], children[2])
         typespec = children[1]
         assert isinstance(typespec, str)
-        dct: dict[str, Union[str, tuple[str, int]]] = {
-            'time': 'builtin_interfaces/msg/Time',
-            'duration': 'builtin_interfaces/msg/Duration',
-            'byte': 'octet',
-            'char': 'uint8',
-            'string': ('string', 0),
-        }
-        return Nodetype.NAME, dct.get(typespec, typespec)
+        return Nodetype.NAME, self.ALIASES.get(typespec, typespec)
 
     def visit_scoped_name(
         self,
@@ -353,6 +361,21 @@ class VisitorMSG(Visitor):
         return children[1]
 
 
+@lru_cache(maxsize=512)
+def parse_msg(text: str, name: str) -> Typesdict:
+    """Parse msg message definition, reusing results for repeated definitions.
+
+    Args:
+        text: Message definiton.
+        name: Message typename.
+
+    Returns:
+        Shared types dictionary, must not be modified.
+
+    """
+    return parse_message_definition(VisitorMSG(), f'MSG: {name}\n{text}')
+
+
 def get_types_from_msg(text: str, name: str) -> Typesdict:
     """Get type from msg message definition.
 
@@ -364,7 +387,27 @@ def get_types_from_msg(text: str, name: str) -> Typesdict:
         list with single message name and parsetree.
 
     """
-    return parse_message_definition(VisitorMSG(), f'MSG: {name}\n{text}')
+    return dict(parse_msg(text, name))
+
+
+@lru_cache(maxsize=1024)
+def get_rihs01(name: str, msgdef: str) -> str:
+    """Compute RIHS01 hash of msg message definition.
+
+    Args:
+        name: Message typename.
+        msgdef: Message definition.
+
+    Returns:
+        RIHS01 hash.
+
+    """
+    types = get_types_from_msg(msgdef, name)
+
+    class Store:  # pylint: disable=too-few-public-methods
+        FIELDDEFS = types
+
+    return hash_rihs01(name, Store)
 
 
 def gendefhash(
@@ -473,6 +516,7 @@ def gendefhash(
     return '\n'.join(deftext), md5('\n'.join(hashtext).encode()).hexdigest()
 
 
+@lru_cache(maxsize=512)
 def generate_msgdef(
     typename: str,
     typestore: Typestore = types,
@@ -480,6 +524,8 @@ def generate_msgdef(
 ) -> tuple[str, str]:
     """Generate message definition for type.
 
+    Results are cached, registered types never change their definition.
+
     Args:
         typename: Name of type to generate definition for.
         typestore: Custom type store.
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import re
 import sys
+from functools import lru_cache
 from importlib.util import module_from_spec, spec_from_loader
 from typing import TYPE_CHECKING
 
@@ -26,6 +27,7 @@ if TYPE_CHECKING:
 INTLIKE = re.compile('^u?(bool|int|float)')
 
 
+@lru_cache(maxsize=4096)
 def get_typehint(desc: Fielddesc) -> str:
     """Get python type hint for field.
 
@@ -62,6 +64,21 @@ def get_typehint(desc: Fielddesc) -> str:
     return f'list[{get_typehint(sub)}]'
 
 
+def get_ftype(ftype: tuple[int, Any]) -> tuple[int, Any]:
+    """Get field descriptor with plain integer node types.
+
+    Args:
+        ftype: Field descriptor from parse tree.
+
+    Returns:
+        Field descriptor as stored in FIELDDEFS.
+
+    """
+    if ftype[0] <= 2:
+        return int(ftype[0]), ftype[1]
+    return int(ftype[0]), ((int(ftype[1][0][0]), ftype[1][0][1]), ftype[1][1])
+
+
 def generate_python_code(typs: Typesdict) -> str:
     """Generate python code from types dictionary.
 
@@ -123,11 +140,6 @@ def generate_python_code(typs: Typesdict) -> str:
             '',
         ]
 
-    def get_ftype(ftype: tuple[int, Any]) -> tuple[int, Any]:
-        if ftype[0] <= 2:
-            return int(ftype[0]), ftype[1]
-        return int(ftype[0]), ((int(ftype[1][0][0]), ftype[1][0][1]), ftype[1][1])
-
     lines += ['FIELDDEFS: Typesdict = {']
     for name, (consts, fields) in typs.items():
         pyname = name.replace('/', '__')
@@ -161,6 +173,8 @@ def generate_python_code(typs: Typesdict) -> str:
 def register_types(typs: Typesdict, typestore: Typestore = types) -> None:
     """Register types in type system.
 
+    Python classes are only generated for types not yet in the type store.
+
     Args:
         typs: Dictionary mapping message typenames to parsetrees.
         typestore: Type store.
@@ -169,16 +183,14 @@ def register_types(typs: Typesdict, typestore: Typestore = types) -> None:
         TypesysError: Type already present with different definition.
 
     """
-    code = generate_python_code(typs)
-    name = 'rosbags.usertypes'
-    spec = spec_from_loader(name, loader=None)
-    assert spec
-    module = module_from_spec(spec)
-    sys.modules[name] = module
-    exec(code, module.__dict__)  # pylint: disable=exec-used
-    fielddefs: Typesdict = module.FIELDDEFS
-
-    for name, (_, fields) in fielddefs.items():
+    fielddefs: dict[str, list[tuple[str, tuple[int, Any]]]] = {
+        name: [
+            (fname, get_ftype(ftype)) for fname, ftype in fields or
+            [('structure_needs_at_least_one_member', (1, 'uint8'))]
+        ] for name, (_, fields) in typs.items()
+    }
+
+    for name, fields in fielddefs.items():
         if name == 'std_msgs/msg/Header':
             continue
         if have := typestore.FIELDDEFS.get(name):
@@ -188,7 +200,19 @@ def register_types(typs: Typesdict, typestore: Typestore = types) -> None:
             if have_fields != fields:
                 raise TypesysError(f'Type {name!r} is already present with different definition.')
 
-    for name in fielddefs.keys() - typestore.FIELDDEFS.keys():
+    added = {k: v for k, v in typs.items() if k not in typestore.FIELDDEFS}
+    if not added:
+        return
+
+    code = generate_python_code(added)
+    name = 'rosbags.usertypes'
+    spec = spec_from_loader(name, loader=None)
+    assert spec
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    exec(code, module.__dict__)  # pylint: disable=exec-used
+
+    for name in added:
         pyname = name.replace('/', '__')
         setattr(typestore, pyname, getattr(module, pyname))
-        typestore.FIELDDEFS[name] = fielddefs[name]
+        typestore.FIELDDEFS[name] = module.FIELDDEFS[name]
@@ -5,21 +5,26 @@
 from __future__ import annotations
 
 import sys
+from contextlib import closing
 from pathlib import Path
 from typing import TYPE_CHECKING
-from unittest.mock import call, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 
 from rosbags.convert import ConverterError, convert
 from rosbags.convert.__main__ import main
-from rosbags.convert.converter import LATCH
+from rosbags.convert.converter import CACHE_MAX_MSGSIZE, LATCH, cached, prefetch
 from rosbags.interfaces import Connection, ConnectionExtRosbag1, ConnectionExtRosbag2
+from rosbags.rosbag1 import Reader as Reader1
 from rosbags.rosbag1 import ReaderError
+from rosbags.rosbag2 import Writer as Writer2
 from rosbags.rosbag2 import WriterError
+from rosbags.serde import deserialize_ros1, serialize_cdr
+from rosbags.typesys.types import std_msgs__msg__String as String
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Generator
 
 
 def test_cliwrapper(tmp_path: Path) -> None:
@@ -442,3 +447,53 @@ def test_convert_2to1(tmp_path: Path) -> None:
         reader.side_effect = ReaderError('exc')
         with pytest.raises(ConverterError, match='Reading source bag: exc'):
             convert(Path('foo'), None)
+
+
+def test_convert_2to1_sqlite3(tmp_path: Path) -> None:
+    """Test conversion of an on-disk sqlite3 rosbag2."""
+    src = tmp_path / 'ros2'
+    with Writer2(src) as writer:
+        conn = writer.add_connection('/topic', String.__msgtype__)
+        for idx in range(3):
+            data = bytes(serialize_cdr(String(f'msg{idx}'), String.__msgtype__))
+            writer.write(conn, 42 + idx, data)
+
+    convert(src, None)
+
+    with Reader1(tmp_path / 'ros2.bag') as reader:
+        assert [x.topic for x in reader.connections] == ['/topic']
+        assert [
+            (timestamp, deserialize_ros1(data, String.__msgtype__).data)
+            for _, timestamp, data in reader.messages()
+        ] == [(42, 'msg0'), (43, 'msg1'), (44, 'msg2')]
+
+
+def test_prefetch() -> None:
+    """Test background prefetching of messages."""
+    assert list(prefetch(range(1000), maxsize=4)) == list(range(1000))
+
+    def failing() -> Generator[int, None, None]:
+        yield 1
+        raise ReaderError('exc')
+
+    with pytest.raises(ReaderError, match='exc'):
+        list(prefetch(failing()))
+
+    with closing(prefetch(range(1000), maxsize=4)) as messages:
+        assert next(messages) == 0
+
+
+def test_cached() -> None:
+    """Test caching of message conversions."""
+    func = Mock(side_effect=lambda x, _: memoryview(x))
+    convert_msg = cached(func)
+
+    assert bytes(convert_msg(b'\x42', 'typ')) == b'\x42'
+    assert bytes(convert_msg(b'\x42', 'typ')) == b'\x42'
+    assert bytes(convert_msg(b'\x42', 'other')) == b'\x42'
+    assert func.call_count == 2
+
+    large = bytes(CACHE_MAX_MSGSIZE + 1)
+    assert convert_msg(large, 'typ') == large
+    assert convert_msg(large, 'typ') == large
+    assert func.call_count == 4
@@ -285,6 +285,10 @@ def test_parse_multi_msg() -> None:
     consts = ret['test_msgs/msg/Other'][0]
     assert consts == [('static', 'uint32', 42)]
 
+    again = get_types_from_msg(MULTI_MSG, 'test_msgs/msg/Foo')
+    assert again == ret
+    assert again is not ret
+
 
 def test_parse_cstring_confusion() -> None:
     """Test if msg separator is confused with const string."""
@@ -394,6 +398,7 @@ def test_generate_msgdef() -> None:
         'geometry_msgs/Vector3 linear\ngeometry_msgs/Vector3 angular\n',
         'MSG: geometry_msgs/Vector3\nfloat64 x\nfloat64 y\nfloat64 z\n',
     ]
+    assert generate_msgdef('geometry_msgs/msg/Twist') is res
 
     res = generate_msgdef('shape_msgs/msg/Mesh')
     assert res[0].split(f'{"=" * 80}\n') == [
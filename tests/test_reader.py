@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import sqlite3
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from itertools import groupby
 from pathlib import Path
@@ -18,14 +19,23 @@ import pytest
 import zstandard
 
 from rosbags.rosbag2 import Reader, ReaderError, Writer
+from rosbags.rosbag2.storage_mcap import (
+    ReaderMcap,
+    get_pool,
+    load_chunk,
+    merge_msgsrcs,
+    zstd_decompress,
+)
 
 from .test_serde import MSG_JOINT, MSG_MAGN, MSG_MAGN_BIG, MSG_POLY
 
 if TYPE_CHECKING:
-    from typing import BinaryIO, Iterable
+    from typing import Any, BinaryIO, Generator, Iterable
 
     from _pytest.fixtures import SubRequest
 
+    from rosbags.rosbag2.storage_mcap import Msg
+
 METADATA = """
 rosbag2_bagfile_information:
   version: 4
@@ -167,6 +177,17 @@ def test_empty_bag(tmp_path: Path) -> None:
         assert reader.ros_distro == 'rosbags'
 
 
+def test_custom_data_yaml12(tmp_path: Path) -> None:
+    """Test custom_data values are loaded as YAML 1.2 strings."""
+    metadata = METADATA_EMPTY.replace('key2: value2', 'key2: off\n    key3: 1:30')
+    (tmp_path / 'metadata.yaml').write_text(metadata)
+    dbh = sqlite3.connect(tmp_path / 'db.db3')
+    dbh.executescript(Writer.SQLITE_SCHEMA)
+
+    with Reader(tmp_path) as reader:
+        assert reader.custom_data == {'key1': 'value1', 'key2': 'off', 'key3': '1:30'}
+
+
 def test_reader(bag: Path) -> None:
     """Test reader and deserializer on simple bag."""
     with Reader(bag) as reader:
@@ -238,6 +259,22 @@ def test_message_filters(bag: Path) -> None:
             next(gen)
 
 
+def test_message_connections(tmp_path: Path) -> None:
+    """Test messages yield connections with message definitions."""
+    path = tmp_path / 'rosbag2'
+    with Writer(path) as writer:
+        connection = writer.add_connection('/test', 'std_msgs/msg/Int8')
+        writer.write(connection, 42, b'\x00\x01\x00\x00\x2a')
+
+    with Reader(path) as reader:
+        for connections in [(), reader.connections]:
+            messages = list(reader.messages(connections=connections))
+            assert len(messages) == 1
+            connection = messages[0][0]
+            assert connection is reader.connections[0]
+            assert connection.msgdef
+
+
 def test_user_errors(bag: Path) -> None:
     """Test user errors."""
     reader = Reader(bag)
@@ -254,7 +291,7 @@ def test_failure_cases(tmp_path: Path) -> None:
 
     metadata.write_text('')
     with pytest.raises(ReaderError, match='not read'), \
-         mock.patch.object(Path, 'read_text', side_effect=PermissionError):
+         mock.patch.object(Path, 'read_bytes', side_effect=PermissionError):
         Reader(tmp_path)
 
     metadata.write_text('  invalid:\nthis is not yaml')
@@ -408,7 +445,14 @@ CHANNELS = [
 
 
 @pytest.fixture(
-    params=['unindexed', 'partially_indexed', 'indexed', 'chunked_unindexed', 'chunked_indexed'],
+    params=[
+        'unindexed',
+        'partially_indexed',
+        'indexed',
+        'chunked_unindexed',
+        'chunked_partially_indexed',
+        'chunked_indexed',
+    ],
 )
 def bag_mcap(request: SubRequest, tmp_path: Path) -> Path:
     """Manually contruct mcap bag."""
@@ -592,7 +636,12 @@ def bag_mcap(request: SubRequest, tmp_path: Path) -> Path:
             bio = realbio
             messages = []
 
-        if request.param in ['indexed', 'partially_indexed', 'chunked_indexed']:
+        if request.param in [
+            'indexed',
+            'partially_indexed',
+            'chunked_partially_indexed',
+            'chunked_indexed',
+        ]:
             summary_start = bio.tell()
             for schema in SCHEMAS:
                 write_record(bio, *schema)
@@ -711,6 +760,115 @@ def test_message_filters_mcap(bag_mcap: Path) -> None:
             next(gen)
 
 
+def test_message_connections_mcap(bag_mcap: Path) -> None:
+    """Test messages yield connections with message definitions."""
+    with Reader(bag_mcap) as reader:
+        for connections in [(), reader.connections]:
+            for connection, _, _ in reader.messages(connections=connections):
+                assert any(connection is x for x in reader.connections)
+                assert connection.msgdef
+
+
+def test_message_index_mcap(bag_mcap: Path) -> None:
+    """Test chunks without indexed messages in range are not read."""
+    with Reader(bag_mcap) as reader:
+        assert isinstance(reader.storage, ReaderMcap)
+        mcap = reader.storage.readers[0]
+        assert mcap.bio
+        channel_map = {x.id: x for x in reader.connections}
+        pool = mock.Mock()
+        for chunk in mcap.chunks:
+            assert load_chunk(chunk, channel_map, 0, 1, mcap.bio, pool) == ([], None)
+            entries, future = load_chunk(chunk, channel_map, 0, 2**63 - 1, mcap.bio, pool)
+            assert entries
+            assert future
+            assert len(future.result()) == chunk.uncompressed_size
+        pool.submit.assert_not_called()
+
+        for chunk in mcap.chunks[:1]:
+            chunk = chunk._replace(compression='zstd')
+            _, future = load_chunk(chunk, channel_map, 0, 2**63 - 1, mcap.bio, pool)
+            assert future is pool.submit.return_value
+
+
+def test_mcap_prefetch_window(bag_mcap: Path) -> None:
+    """Test chunk prefetching is bounded in count and size."""
+    with Reader(bag_mcap) as reader:
+        assert isinstance(reader.storage, ReaderMcap)
+        chunks = reader.storage.readers[0].chunks
+        for name, limit in [('PREFETCH_CHUNKS', 1), ('PREFETCH_BYTES', 0)]:
+            with mock.patch(f'rosbags.rosbag2.storage_mcap.{name}', limit), \
+                 mock.patch('rosbags.rosbag2.storage_mcap.load_chunk', wraps=load_chunk) as load:
+                gen = reader.messages()
+                next(gen)
+                assert load.call_count == min(len(chunks), 1)
+                assert len(list(gen)) == 3
+                assert load.call_count == len(chunks)
+    assert get_pool() is get_pool()
+
+
+def test_mcap_prefetch_cancel(bag_mcap: Path) -> None:
+    """Test prefetched chunks are cancelled when reading stops early."""
+    futures: list[mock.Mock] = []
+
+    def load(*args: Any) -> tuple[list[tuple[int, int, int]], mock.Mock]:  # noqa: ANN401
+        entries, future = load_chunk(*args)
+        futures.append(mock.Mock(wraps=future))
+        return entries, futures[-1]
+
+    with Reader(bag_mcap) as reader, \
+         mock.patch('rosbags.rosbag2.storage_mcap.load_chunk', side_effect=load):
+        assert isinstance(reader.storage, ReaderMcap)
+        chunks = reader.storage.readers[0].chunks
+        gen = reader.messages()
+        next(gen)
+        gen.close()
+
+    assert len(futures) == len(chunks)
+    for future in futures[1:]:
+        future.cancel.assert_called_once()
+
+
+def test_merge_msgsrcs() -> None:
+    """Test chunk message sources are merged lazily in time order."""
+    started = []
+
+    def src(idx: int, timestamps: list[int]) -> Generator[Msg, None, None]:
+        started.append(idx)
+        for timestamp in timestamps:
+            yield timestamp, idx * 10 + timestamp, mock.Mock(), b''
+
+    chunks = [mock.Mock(message_start_time=x) for x in (1, 2, 2, 6)]
+    msgsrcs = [src(0, [1, 3, 5]), src(1, []), src(2, [2, 4]), src(3, [6])]
+    gen = merge_msgsrcs(chunks, msgsrcs)
+    assert next(gen)[0] == 1
+    assert started == [0]
+    assert [x[0] for x in gen] == [2, 3, 4, 5, 6]
+    assert started == [0, 1, 2, 3]
+
+
+def test_mcap_files_are_read_in_order() -> None:
+    """Test split mcap files are read one after another."""
+    first, second = mock.Mock(), mock.Mock()
+    first.messages.return_value = iter([(None, 1, b''), (None, 2, b'')])
+    second.messages.return_value = iter([(None, 3, b''), (None, 4, b'')])
+    storage = ReaderMcap([], [])
+    storage.readers = [first, second]
+    messages = storage.messages()
+    assert [next(messages)[1], next(messages)[1]] == [1, 2]
+    assert not second.messages.called
+    assert [x[1] for x in messages] == [3, 4]
+
+
+def test_zstd_decompress() -> None:
+    """Test zstd decompression from multiple threads."""
+    data = [bytes(range(x, 256)) * 64 for x in range(8)]
+    compressed = [zstandard.ZstdCompressor().compress(x) for x in data]
+    with ThreadPoolExecutor(4) as pool:
+        res = list(pool.map(zstd_decompress, compressed, [len(x) for x in data]))
+    assert res == data
+
+
 def test_bag_mcap_files(tmp_path: Path) -> None:
     """Test bad mcap files."""
     (tmp_path / 'metadata.yaml').write_text(
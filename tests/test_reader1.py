@@ -219,7 +219,9 @@ def test_reader(tmp_path: Path) -> None:  # pylint: disable=too-many-statements
             create_message(time=42),
         ]],
     )
-    with Reader(bag) as reader:
+    reader = Reader(bag)
+    assert not reader.topics
+    with reader:
         assert reader.message_count == 1
         assert reader.duration == 1
         assert reader.start_time == 42 * 10**9
@@ -20,6 +20,8 @@ from rosbags.serde import (
     serialize_ros1,
 )
 from rosbags.serde.messages import get_msgdef
+from rosbags.serde.ros1 import generate_deserialize_ros1
+from rosbags.serde.utils import compile_lines, compile_source
 from rosbags.typesys import get_types_from_msg, register_types, types
 from rosbags.typesys.types import builtin_interfaces__msg__Time as Time
 from rosbags.typesys.types import geometry_msgs__msg__Polygon as Polygon
@@ -178,6 +180,39 @@ test_msgs/msg/dynamic_64_s[] seq_msg_d6s
 test_msgs/msg/dynamic_s_64[] seq_msg_ds6
 """
 
+STATIC_COALESCE = """
+uint8 u8a
+uint8 u8b
+uint16 u16
+float64 f64
+int32[2] i32
+"""
+
+BYTE_ARRAYS = """
+uint8[2] u8
+int8[] i8
+uint16[2] u16
+float64[] f64
+"""
+
+PADDED = """
+float64 f64
+uint8 u8
+"""
+
+LONG_ARRAYS = """
+string[9] strs
+test_msgs/msg/padded[9] padded
+"""
+
+SCALAR_RUNS = """
+bool b
+int16 i16
+string s
+uint64 u64
+float32 f32
+"""
+
 SU64_B = """
 uint64[] su64
 bool b
@@ -452,6 +487,33 @@ def test_ros1_to_cdr() -> None:
     assert serialize_cdr(deserialize_ros1(msg_ros, msgtype), msgtype) == msg_cdr
 
 
+def test_ros1_cdr_identical_layout() -> None:
+    """Test conversion of messages with identical ROS1 and CDR layout."""
+    msgtype = 'geometry_msgs/msg/Point'
+    msg_ros = bytes(range(24))
+    msg_cdr = b'\x00\x01\x00\x00' + msg_ros
+
+    assert ros1_to_cdr(msg_ros, msgtype) == msg_cdr
+    assert ros1_to_cdr(memoryview(msg_ros), msgtype) == msg_cdr  # type: ignore[arg-type]
+    assert cdr_to_ros1(msg_cdr, msgtype) == msg_ros
+    assert cdr_to_ros1(msg_cdr + b'\x00\x00', msgtype) == msg_ros
+    assert cdr_to_ros1(bytearray(msg_cdr), msgtype).readonly  # type: ignore[arg-type]
+    assert serialize_cdr(deserialize_ros1(msg_ros, msgtype), msgtype) == msg_cdr
+    assert serialize_ros1(deserialize_cdr(msg_cdr, msgtype), msgtype) == msg_ros
+
+
+def test_ros1_cdr_coalesced_fields() -> None:
+    """Test conversion of adjacent fixed size fields."""
+    msgtype = 'test_msgs/msg/static_coalesce'
+    register_types(dict(get_types_from_msg(STATIC_COALESCE, msgtype)))
+    msg_ros = bytes(range(20))
+    msg_cdr = b'\x00\x01\x00\x00' + msg_ros[:4] + b'\x00' * 4 + msg_ros[4:]
+
+    assert ros1_to_cdr(msg_ros, msgtype) == msg_cdr
+    assert cdr_to_ros1(msg_cdr, msgtype) == msg_ros
+    assert serialize_cdr(deserialize_ros1(msg_ros, msgtype), msgtype) == msg_cdr
+
+
 def test_cdr_to_ros1() -> None:
     """Test CDR to ROS1 conversion."""
     msgtype = 'test_msgs/msg/static_16_64'
@@ -481,10 +543,99 @@ def test_cdr_to_ros1() -> None:
     assert serialize_ros1(deserialize_cdr(msg_cdr, msgtype), msgtype) == msg_ros
 
     header = Header(stamp=Time(42, 666), frame_id='frame')
-    msg_ros = cdr_to_ros1(serialize_cdr(header, 'std_msgs/msg/Header'), 'std_msgs/msg/Header')
+    msg_cdr = bytes(serialize_cdr(header, 'std_msgs/msg/Header'))
+    msg_ros = bytes(cdr_to_ros1(msg_cdr, 'std_msgs/msg/Header'))
     assert msg_ros == b'\x00\x00\x00\x00*\x00\x00\x00\x9a\x02\x00\x00\x05\x00\x00\x00frame'
 
 
+def test_ros1_byte_arrays() -> None:
+    """Test byte order handling of ROS1 arrays."""
+    msgtype = 'test_msgs/msg/byte_arrays'
+    register_types(dict(get_types_from_msg(BYTE_ARRAYS, msgtype)))
+    msgdef = get_msgdef(msgtype, types)
+    msg = msgdef.cls(
+        numpy.array([1, 2], dtype=numpy.uint8),
+        numpy.array([-1], dtype=numpy.int8),
+        numpy.array([1, 2], dtype='>u2'),
+        numpy.array([1.5], dtype=numpy.float64),
+    )
+    rawdata = bytes(serialize_ros1(msg, msgtype))
+    assert rawdata == (
+        b'\x01\x02'
+        b'\x01\x00\x00\x00\xff'
+        b'\x01\x00\x02\x00'
+        b'\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf8\x3f'
+    )
+    res = deserialize_ros1(rawdata, msgtype)
+    assert res.u8.tolist() == [1, 2]
+    assert res.i8.tolist() == [-1]
+    assert res.u16.tolist() == [1, 2]
+    assert res.f64.tolist() == [1.5]
+    assert not res.f64.flags.writeable
+    buf = bytearray(rawdata)
+    res = deserialize_ros1(buf, msgtype)  # type: ignore
+    assert res.f64.flags.writeable
+    buf[0] = 42
+    assert res.u8.tolist() == [42, 2]
+
+    with patch('rosbags.serde.ros1.sys') as sysmock:
+        sysmock.byteorder = 'big'
+        func = generate_deserialize_ros1(msgdef.fields, msgtype)
+    res, _ = func(rawdata, 0, msgdef.cls, types)
+    assert res.u8.tolist() == [1, 2]
+    assert res.i8.tolist() == [-1]
+    assert res.u16.tolist() == [0x100, 0x200]
+    assert res.f64.tobytes() == b'\x00\x00\x00\x00\x00\x00\xf8\x3f'[::-1]
+
+    msg = msgdef.cls(
+        numpy.array([1, 2], dtype=numpy.uint8),
+        numpy.array([-1], dtype=numpy.int8),
+        numpy.array([1, 2], dtype='>u2'),
+        numpy.array([1.5], dtype='>f8'),
+    )
+    assert serialize_ros1(msg, msgtype) == rawdata
+    assert msg.u16.tolist() == [1, 2]
+    assert msg.f64.tolist() == [1.5]
+
+
+def test_ros1_cdr_long_arrays() -> None:
+    """Test conversion of arrays too long to be unrolled."""
+    register_types(dict(get_types_from_msg(PADDED, 'test_msgs/msg/padded')))
+    register_types(dict(get_types_from_msg(LONG_ARRAYS, 'test_msgs/msg/long_arrays')))
+    padded = get_msgdef('test_msgs/msg/padded', types).cls
+    long_arrays = get_msgdef('test_msgs/msg/long_arrays', types).cls
+    msg = long_arrays(
+        [str(x) * x for x in range(9)],
+        [padded(x / 2, x) for x in range(9)],
+    )
+
+    cdr = bytes(serialize_cdr(msg, msg.__msgtype__))
+    ros1 = bytes(serialize_ros1(msg, msg.__msgtype__))
+    assert cdr_to_ros1(cdr, msg.__msgtype__) == ros1
+    assert ros1_to_cdr(ros1, msg.__msgtype__) == cdr
+
+
+@pytest.mark.usefixtures('_comparable')
+def test_ros1_scalar_runs() -> None:
+    """Test adjacent scalars are serialized with shared structs."""
+    msgtype = 'test_msgs/msg/scalar_runs'
+    register_types(dict(get_types_from_msg(SCALAR_RUNS, msgtype)))
+    scalar_runs = get_msgdef(msgtype, types).cls
+    msg = scalar_runs(True, -2, 'ab', 3, 1.5)
+    rawdata = (
+        b'\x01\xfe\xff'
+        b'\x02\x00\x00\x00ab'
+        b'\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc0\x3f'
+    )
+
+    assert serialize_ros1(msg, msgtype) == rawdata
+    assert deserialize_ros1(rawdata, msgtype) == msg
+
+    rawdata = serialize_ros1(Time(1, 2), Time.__msgtype__)
+    assert rawdata == b'\x01\x00\x00\x00\x02\x00\x00\x00'
+    assert deserialize_ros1(rawdata, Time.__msgtype__) == Time(1, 2)
+
+
 @pytest.mark.usefixtures('_comparable')
 def test_padding_empty_sequence() -> None:
     """Test empty sequences do not add item padding."""
@@ -575,3 +726,13 @@ def test_empty_message_handling() -> None:
     assert cdr_to_ros1(aligned_cdr_bytes, aligned_msg.__msgtype__) == aligned_ros1_bytes
     assert ros1_to_cdr(unaligned_ros1_bytes, unaligned_msg.__msgtype__) == unaligned_cdr_bytes
     assert ros1_to_cdr(aligned_ros1_bytes, aligned_msg.__msgtype__) == aligned_cdr_bytes
+
+
+def test_compile_lines_reuses_code() -> None:
+    """Test identical sources are compiled once into fresh modules."""
+    hits = compile_source.cache_info().hits
+    first = compile_lines(['values = []'])
+    second = compile_lines(['values = []'])
+    assert compile_source.cache_info().hits == hits + 1
+    assert first is not second
+    assert first.values is not second.values
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import sqlite3
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
 
@@ -169,3 +170,40 @@ def test_raises_on_closed_reader(tmp_path: Path) -> None:
 
     with pytest.raises(ReaderError):
         next(reader.messages())
+
+
+def test_messages_are_merged_across_files(tmp_path: Path) -> None:
+    """Test messages of split files are read in time order."""
+    paths = []
+    for idx in range(3):
+        dbpath = tmp_path / f'db_{idx}.db3'
+        con = sqlite3.connect(dbpath)
+        con.executescript(SQLITE_SCHEMA_V4)
+        with con:
+            con.execute(
+                'INSERT INTO topics(id, name, type, serialization_format, offered_qos_profiles,'
+                ' type_description_hash) VALUES (?, ?, ?, ?, ?, ?);',
+                (idx + 1, f'/topic{idx}', 'std_msgs/msg/Empty', 'cdr', '', ''),
+            )
+            con.executemany(
+                'INSERT INTO messages(topic_id, timestamp, data) VALUES (?, ?, ?);',
+                [(idx + 1, x, bytes([idx])) for x in range(idx, 9, 3)],
+            )
+        con.close()
+        paths.append(dbpath)
+
+    connections = [mock.Mock(topic=f'/topic{x}') for x in range(3)]
+    reader = ReaderSqlite3(paths, connections)
+    reader.open()
+    assert len(reader.dbconns) == 1
+    assert [(x[0].topic, x[1], x[2]) for x in reader.messages()] == [
+        (f'/topic{x % 3}', x, bytes([x % 3])) for x in range(9)
+    ]
+    assert [x[1] for x in reader.messages(connections[1:2], start=2, stop=8)] == [4, 7]
+    reader.close()
+
+    with mock.patch('rosbags.rosbag2.storage_sqlite3.MAX_ATTACHED', 1):
+        reader.open()
+    assert len(reader.dbconns) == 2
+    assert [x[1] for x in reader.messages()] == [0, 1, 3, 4, 6, 7, 2, 5, 8]
+    reader.close()
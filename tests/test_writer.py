@@ -4,12 +4,13 @@
 
 from __future__ import annotations
 
+import sqlite3
 from typing import TYPE_CHECKING
 
 import pytest
 
 from rosbags.interfaces import Connection, ConnectionExtRosbag2
-from rosbags.rosbag2 import Writer, WriterError
+from rosbags.rosbag2 import Reader, Writer, WriterError
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -99,6 +100,11 @@ def test_failure_cases(tmp_path: Path) -> None:
     with pytest.raises(WriterError, match='already open'):
         bag.set_compression(bag.CompressionMode.FILE, bag.CompressionFormat.ZSTD)
 
+    bag = Writer(tmp_path / 'preset_after_open')
+    bag.open()
+    with pytest.raises(WriterError, match='already open'):
+        bag.set_storage_preset(bag.StoragePreset.RESILIENT)
+
     bag = Writer(tmp_path / 'topic')
     with pytest.raises(WriterError, match='was not opened'):
         bag.add_connection('/tf', 'tf2_msgs/msg/TFMessage')
@@ -140,3 +146,81 @@ def test_failure_cases(tmp_path: Path) -> None:
     )
     with pytest.raises(WriterError, match='unknown connection'):
         bag.write(connection, 42, b'\x00')
+
+
+@pytest.mark.parametrize('mode', [Writer.CompressionMode.NONE, Writer.CompressionMode.MESSAGE])
+def test_batched_inserts(tmp_path: Path, mode: Writer.CompressionMode) -> None:
+    """Test messages are flushed in batches."""
+    path = tmp_path / 'rosbag2'
+    bag = Writer(path)
+    bag.set_compression(mode, bag.CompressionFormat.ZSTD)
+    bag.INSERT_BATCH_SIZE = 2
+    bag.COMMIT_INTERVAL = 2
+    bag.OPTIMIZE_MIN_MESSAGES = 5
+    with bag:
+        connection = bag.add_connection('/test', 'std_msgs/msg/Int8')
+        for idx in range(5):
+            bag.write(connection, idx, bytes([idx]))
+            assert len(bag.msgbuf) == (idx + 1) % 2
+
+        conn = sqlite3.connect(path / 'rosbag2.db3')
+        committed = conn.execute('SELECT count(*) FROM messages').fetchone()
+        conn.close()
+        assert committed == ((4 if mode == bag.CompressionMode.NONE else 2),)
+    assert not bag.msgbuf
+    assert not bag.pending
+
+    conn = sqlite3.connect(path / 'rosbag2.db3')
+    indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    conn.close()
+    assert indexes == [('timestamp_idx',)]
+
+    with Reader(path) as reader:
+        assert reader.message_count == 5
+        assert [x[1:] for x in reader.messages()] == [(x, bytes([x])) for x in range(5)]
+
+
+@pytest.mark.parametrize('mode', [Writer.CompressionMode.NONE, Writer.CompressionMode.MESSAGE])
+def test_reused_buffer(tmp_path: Path, mode: Writer.CompressionMode) -> None:
+    """Test buffered messages are not affected by buffer reuse."""
+    path = tmp_path / 'rosbag2'
+    buf = bytearray(1)
+    bag = Writer(path)
+    bag.set_compression(mode, bag.CompressionFormat.ZSTD)
+    bag.INSERT_BATCH_SIZE = 2
+    with bag:
+        connection = bag.add_connection('/test', 'std_msgs/msg/Int8')
+        for idx in range(3):
+            buf[0] = idx
+            bag.write(connection, idx, buf)  # type: ignore[arg-type]
+
+    with Reader(path) as reader:
+        assert [x[2] for x in reader.messages()] == [b'\x00', b'\x01', b'\x02']
+
+
+def test_storage_presets(tmp_path: Path) -> None:
+    """Test storage presets."""
+    for preset, committed in [
+        (Writer.StoragePreset.DEFAULT, 0),
+        (Writer.StoragePreset.WRITE_OPTIMIZED, 0),
+        (Writer.StoragePreset.RESILIENT, 1),
+    ]:
+        path = tmp_path / preset.name
+        bag = Writer(path)
+        bag.set_storage_preset(preset)
+        bag.INSERT_BATCH_SIZE = 1
+        with bag:
+            connection = bag.add_connection('/test', 'std_msgs/msg/Int8')
+            bag.write(connection, 42, b'\x00')
+
+            conn = sqlite3.connect(path / f'{preset.name}.db3')
+            assert conn.execute('SELECT count(*) FROM messages').fetchone() == (committed,)
+            conn.close()
+
+        conn = sqlite3.connect(path / f'{preset.name}.db3')
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+        conn.close()
+        assert not (path / f'{preset.name}.db3-wal').exists()
+
+        with Reader(path) as reader:
+            assert [x[1:] for x in reader.messages()] == [(42, b'\x00')]